@@ -30,6 +30,11 @@ class Config:
     log_dir: str
     local_base_dir: str = "."
     model_name: Optional[str] = None  # Model override
+    batch_size: int = 1  # Files translated per API request
+    max_workers: int = 1  # Concurrent API requests per cycle
+    use_async: bool = False  # Run concurrent requests on one asyncio event loop (needs aiohttp)
+    processes: int = 1  # Worker processes per cycle, each translating one file
+    cache_dir: Optional[str] = None  # Translation cache directory (disabled if None)
 
     # --- Derived properties ---
     initial_translation_type: TypeOfTranslation = field(init=False)
@@ -46,6 +51,13 @@ class Config:
         else:
             raise ValueError(f"Invalid translation_type: {self.initial_translation_type_str}")
 
+        if self.batch_size < 1:
+            raise ValueError(f"Invalid batch_size: {self.batch_size}")
+        if self.max_workers < 1:
+            raise ValueError(f"Invalid max_workers: {self.max_workers}")
+        if self.processes < 1:
+            raise ValueError(f"Invalid processes: {self.processes}")
+
         # Resolve model name with dotfile fallback
         self.resolved_model_name = self._resolve_model_name()
 
@@ -165,3 +177,11 @@ class Config:
             raise
 
         return os.path.join(local_log_dir, "backtranslate.log")
+
+    @property
+    def error_log_filepath(self) -> str:
+        """
+        Returns the absolute path to the file recording per-file translation failures.
+        Unlike log_filepath, this does not create the log directory.
+        """
+        return os.path.join(self.local_base_dir, self.log_dir, "errors.log")
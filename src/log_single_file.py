@@ -2,58 +2,160 @@
 Logs the completion of a cycle using standard Python logging.
 """
 
+import atexit
+import itertools
 import os
 import logging
+import logging.handlers
+import multiprocessing
+import queue
+from typing import Dict, Optional
 from . import update_custom_log
+from . import utils
 from .config import Config # Import Config
 
-# --- Logging Configuration Flag ---
-_logger_configured = False
+# Format of every log line, in the parent and in worker processes
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+# Background listener that writes queued records to the file and console handlers
+_listener: Optional[logging.handlers.QueueListener] = None
+# The configured log file, keyed by absolute path: its listener-owned file
+# handler, or None if file logging to it failed and console logging is used.
+_file_handlers: Dict[str, Optional[logging.FileHandler]] = {}
 # Get logger for this module
 logger = logging.getLogger(__name__)
 
+
+class _BufferedFileHandler(logging.FileHandler):
+    """FileHandler that lets the file buffer coalesce writes, flushing only for errors."""
+
+    def flush(self):
+        # Skip the per-record flush StreamHandler.emit does; close() still
+        # flushes the buffer when the stream is closed.
+        pass
+
+    def emit(self, record):
+        super().emit(record)
+        if record.levelno >= logging.ERROR:
+            logging.FileHandler.flush(self)
+
+
+@atexit.register
+def stop_logging() -> None:
+    """Write out any queued log records, stop the listener and close its handlers."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+    _file_handlers.clear()
+
 def setup_logging(log_filepath: str):
-    """Configures the root logger to log to a file and console, ensuring it happens only once."""
-    global _logger_configured
-    if not _logger_configured:
-        try:
-            # Ensure the directory exists
-            log_dir = os.path.dirname(log_filepath)
-            os.makedirs(log_dir, exist_ok=True)
-
-            log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-
-            # File Handler
-            file_handler = logging.FileHandler(log_filepath, encoding='utf-8') # Specify encoding
-            file_handler.setFormatter(log_formatter)
-
-            # Console Handler
-            console_handler = logging.StreamHandler()
-            console_handler.setFormatter(log_formatter)
-
-            # Get root logger, remove existing handlers (important for re-runs), add new ones
-            root_logger = logging.getLogger()
-            # Clear existing handlers to prevent duplicates if script is run multiple times in same process
-            for handler in root_logger.handlers[:]:
-                root_logger.removeHandler(handler)
-                handler.close() # Close handlers before removing
-
-            root_logger.addHandler(file_handler)
-            root_logger.addHandler(console_handler)
-            root_logger.setLevel(logging.INFO) # Set level on the root logger
-
-            _logger_configured = True
-            # Use the root logger to announce configuration success
-            logging.info(f"Logging configured. Log file: {log_filepath}")
-
-        except Exception as e:
-            # Fallback to basic console logging if setup fails
-            logging.basicConfig(level=logging.ERROR)
-            logging.error(f"Failed to configure file logging to {log_filepath}: {e}. Falling back to console logging.")
-            _logger_configured = True # Mark as configured to prevent retries
+    """
+    Configures the root logger to log to a file and console.
+
+    Calling it again for the configured file is a dictionary lookup and
+    keeps the existing handlers; a different file replaces them. If file
+    logging cannot be set up, it falls back to console logging and does not
+    retry for the same file.
+
+    Records are put on a queue by the calling thread and written out by a
+    background QueueListener, so logging never blocks on file I/O.
+    """
+    global _listener
+    key = os.path.abspath(log_filepath)
+    if key in _file_handlers:
+        return
+    try:
+        # Ensure the directory exists
+        log_dir = os.path.dirname(log_filepath)
+        os.makedirs(log_dir, exist_ok=True)
+
+        log_formatter = logging.Formatter(LOG_FORMAT)
+
+        # File Handler
+        file_handler = _BufferedFileHandler(log_filepath, encoding='utf-8') # Specify encoding
+        file_handler.setFormatter(log_formatter)
+
+        # Console Handler
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(log_formatter)
+
+        # Stop the listener of an earlier configuration
+        stop_logging()
+        log_queue = queue.SimpleQueue()
+        _listener = logging.handlers.QueueListener(
+            log_queue, file_handler, console_handler, respect_handler_level=True
+        )
+
+        # Get root logger, remove existing handlers (important for re-runs), add new ones
+        root_logger = logging.getLogger()
+        # Clear existing handlers to prevent duplicates if script is run multiple times in same process
+        for handler in root_logger.handlers[:]:
+            root_logger.removeHandler(handler)
+            handler.close() # Close handlers before removing
+
+        root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        root_logger.setLevel(logging.INFO) # Set level on the root logger
+        _listener.start()
+        _file_handlers[key] = file_handler
+
+        # Use the root logger to announce configuration success
+        logging.info("Logging configured. Log file: %s", log_filepath)
+
+    except Exception as e:
+        # Fallback to basic console logging if setup fails
+        logging.basicConfig(level=logging.ERROR)
+        logging.error("Failed to configure file logging to %s: %s. Falling back to console logging.", log_filepath, e)
+        _file_handlers[key] = None # Remember the failure to prevent retries
+
+def setup_worker_logging(log_filepath: str) -> None:
+    """
+    Configures logging in a multiprocessing worker to write to the log file
+    and console directly.
+
+    A forked worker inherits the parent's QueueHandler but not the listener
+    thread that drains its queue, so without this its records are lost. The
+    inherited handlers are dropped without closing them, as closing would
+    write out a copy of the parent's buffered records. The worker's file
+    handler flushes every record, since the pool may terminate the worker
+    at any time; the file is opened for appending, so its lines interleave
+    with the parent's instead of overwriting them.
+
+    Does nothing outside a worker process, e.g. under a thread pool.
+    """
+    global _listener
+    if multiprocessing.parent_process() is None:
+        return
+    root_logger = logging.getLogger()
+    for handler in root_logger.handlers[:]:
+        root_logger.removeHandler(handler)
+    _listener = None # The thread lives in the parent only
+    _file_handlers.clear()
+
+    log_formatter = logging.Formatter(LOG_FORMAT)
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(log_formatter)
+    root_logger.addHandler(console_handler)
+    root_logger.setLevel(logging.INFO)
+    try:
+        file_handler = logging.FileHandler(log_filepath, encoding='utf-8')
+    except OSError as e:
+        logging.error("Failed to configure file logging to %s in worker: %s. Falling back to console logging.", log_filepath, e)
+        file_handler = None
+    else:
+        file_handler.setFormatter(log_formatter)
+        root_logger.addHandler(file_handler)
+    _file_handlers[os.path.abspath(log_filepath)] = file_handler
 
 # --- Cycle Tracking (In-memory) ---
-_current_cycle_count = 0
+# Yields the number of each completed cycle; next() on it is a single C call.
+_cycle_counter = itertools.count(1)
+
+def _reset_cycle_counter(start: int = 1) -> None:
+    """Restarts cycle numbering so the next logged cycle is `start`."""
+    global _cycle_counter
+    _cycle_counter = itertools.count(start)
 
 def log_single_cycle(config: Config) -> None:
     """
@@ -62,8 +164,7 @@ def log_single_cycle(config: Config) -> None:
     Args:
         config: The configuration object.
     """
-    global _current_cycle_count
-    _current_cycle_count += 1
+    cycle = next(_cycle_counter)
 
     # Ensure logging is set up using the path from config
     # setup_logging is also called in main.py, but calling here ensures it's
@@ -73,11 +174,30 @@ def log_single_cycle(config: Config) -> None:
     # Log the cycle completion using the updated update_custom_log
     metric_name = "cycle_completed"
     update_custom_log.update_custom_log(
-        x=_current_cycle_count,
-        y=_current_cycle_count, # Logging the count itself as the metric value
+        x=cycle,
+        y=cycle, # Logging the count itself as the metric value
         name=metric_name,
     )
     # Use the module-specific logger for cycle completion message
-    logger.info(f"--- Cycle {_current_cycle_count} completed. ---")
+    logger.info("--- Cycle %d completed. ---", cycle)
+
+def fast_log_cycle(log_filepath: str, cycle: int) -> None:
+    """
+    Appends the completion line for `cycle` straight to the log file.
+
+    Bypasses the logging framework: no formatting, handler locks or queue,
+    just one write to a descriptor kept open with O_APPEND. Unlike
+    log_single_cycle, it does not number cycles, record the metric or add
+    the timestamp/level prefix, and its lines are not ordered with respect
+    to records still buffered by the listener.
+
+    Not used by the drivers yet. Callers resolve the path once and pass it
+    in, since Config.log_filepath creates the log directory on every access.
+
+    Args:
+        log_filepath: Path of the log file, as returned by Config.log_filepath.
+        cycle: The number of the completed cycle.
+    """
+    utils.append_line(log_filepath, f"--- Cycle {cycle} completed. ---")
 
 # Removed old file-based cycle counter logic
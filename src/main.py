@@ -46,6 +46,35 @@ def parse_args():
         default=None,
         help="Model name override (if omitted, resolved from ~/.model-openrouter or default 'openrouter/free').",
     )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1,
+        help="Number of files translated per API request in each cycle.",
+    )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=1,
+        help="Number of concurrent API requests; above 1, each cycle translates the whole input pool.",
+    )
+    parser.add_argument(
+        "--use-async",
+        action="store_true",
+        help="With --max-workers above 1, send the requests from one asyncio event loop over a shared connection pool (requires aiohttp).",
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=1,
+        help="Number of files translated per cycle, each in its own worker process.",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=None,
+        help="Directory for caching translations by content; identical inputs are not re-translated.",
+    )
     return parser.parse_args()
 
 def main_cli():
@@ -58,6 +87,11 @@ def main_cli():
             pooling_dir=args.pooling_dir,
             log_dir=args.log_dir,
             model_name=args.model,
+            batch_size=args.batch_size,
+            max_workers=args.max_workers,
+            use_async=args.use_async,
+            processes=args.processes,
+            cache_dir=args.cache_dir,
             # local_base_dir defaults to "." in Config class
         )
 
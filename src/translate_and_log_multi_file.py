@@ -3,6 +3,7 @@ Handles back-translation paraphrasing of multiple files using the Gemini API.
 """
 
 import logging
+from typing import Dict, Tuple
 from . import translate_single_file
 from . import log_single_file
 from .config import Config, TypeOfTranslation  # Import Config and Enum
@@ -10,6 +11,10 @@ from .config import Config, TypeOfTranslation  # Import Config and Enum
 # Configure logging for this module
 logger = logging.getLogger(__name__)
 
+# Identical recoverable errors are reported once per block of this many cycles.
+ERROR_REPORT_WINDOW = 100
+
+
 def translate_and_log_single_cycle(
     config: Config,
     current_translation_type: TypeOfTranslation,
@@ -17,31 +22,67 @@ def translate_and_log_single_cycle(
     """
     Performs a single back-translation cycle (translation and logging).
 
+    Errors are not handled here; they propagate to the caller, which decides
+    whether the run can continue.
+
     Args:
         config: The configuration object.
         current_translation_type: The direction for this specific cycle.
     """
-    logger.info(f"Starting cycle for translation type: {current_translation_type.name}")
-    try:
+    logger.info("Starting cycle for translation type: %s", current_translation_type.name)
+    if config.batch_size > 1:
+        translate_single_file.translate_batch(
+            config=config,
+            current_translation_type=current_translation_type,
+            batch_size=config.batch_size,
+        )
+    elif config.processes > 1:
+        translate_single_file.translate_n_files_parallel(
+            config=config,
+            current_translation_type=current_translation_type,
+            n=config.processes,
+        )
+    elif config.max_workers > 1 and config.use_async:
+        translate_single_file.translate_files_async(
+            config=config,
+            current_translation_type=current_translation_type,
+            concurrency=config.max_workers,
+        )
+    elif config.max_workers > 1:
+        translate_single_file.translate_files_concurrent(
+            config=config,
+            current_translation_type=current_translation_type,
+            n_parallel=config.max_workers,
+        )
+    else:
         # Pass config and current type to translate_single_file
         translate_single_file.translate_single_file(
             config=config,
             current_translation_type=current_translation_type,
         )
-        logger.info(f"Translation step completed for {current_translation_type.name}.")
+    logger.info("Translation step completed for %s.", current_translation_type.name)
 
-        # Pass config to log_single_cycle
-        log_single_file.log_single_cycle(config=config)
-        # Logging of cycle completion is handled within log_single_cycle
+    # Pass config to log_single_cycle
+    log_single_file.log_single_cycle(config=config)
+    # Logging of cycle completion is handled within log_single_cycle
 
-    except RuntimeError as e:
-        # Catch errors like "No files found in directory" from translate_single_file
-        logger.error(f"Runtime error during cycle {current_translation_type.name}: {e}. Stopping cycle.")
-        # Depending on desired behavior, you might want to stop all cycles here
-        # by re-raising the error or setting a flag. For now, just log and stop this cycle.
-    except Exception as e:
-        logger.exception(f"Unexpected error during cycle {current_translation_type.name}: {e}")
-        # Log the full traceback for unexpected errors
+
+def _should_report_error(
+    reported: Dict[Tuple[str, int], int],
+    error: Exception,
+    cycle_num: int,
+) -> bool:
+    """
+    Returns True if this error should be logged, False if it is a repeat.
+
+    Errors are keyed by their repr and the block of ERROR_REPORT_WINDOW cycles
+    they occurred in, so a persistent failure is logged once per block instead
+    of once per cycle. Suppressed repeats are counted in `reported`.
+    """
+    key = (repr(error), cycle_num // ERROR_REPORT_WINDOW)
+    count = reported.get(key, 0)
+    reported[key] = count + 1
+    return count == 0
 
 
 def translate_and_log_multi_file(config: Config) -> None:
@@ -52,24 +93,43 @@ def translate_and_log_multi_file(config: Config) -> None:
         config: Configuration object containing all parameters.
     """
     current_translation_type = config.initial_translation_type
-    logger.info(f"Starting multi-file translation for {config.cycles} cycles. Initial type: {current_translation_type.name}")
+    logger.info(
+        "Starting multi-file translation for %d cycles. Initial type: %s",
+        config.cycles, current_translation_type.name,
+    )
+    reported_errors: Dict[Tuple[str, int], int] = {}
 
     for i in range(config.cycles):
         cycle_num = i + 1
-        logger.info(f"--- Beginning Cycle {cycle_num} of {config.cycles} ---")
+        logger.info("--- Beginning Cycle %d of %d ---", cycle_num, config.cycles)
         try:
             translate_and_log_single_cycle(
                 config=config,
                 current_translation_type=current_translation_type,
             )
-            # Reverse translation direction for the next cycle.
-            current_translation_type = (
-                TypeOfTranslation.fr_to_en
-                if current_translation_type == TypeOfTranslation.en_to_fr
-                else TypeOfTranslation.en_to_fr
-            )
+        except RuntimeError as e:
+            # Recoverable errors such as "No files found in directory": skip this cycle.
+            if _should_report_error(reported_errors, e, cycle_num):
+                logger.error(
+                    "Runtime error during cycle %d (%s): %s. Skipping cycle.",
+                    cycle_num, current_translation_type.name, e,
+                )
         except Exception as e:
-             logger.error(f"An error occurred in cycle {cycle_num} ({current_translation_type.name}), stopping further cycles. Error: {e}")
-             break # Stop processing further cycles if one fails critically
+            logger.error(
+                "An error occurred in cycle %d (%s), stopping further cycles. Error: %s",
+                cycle_num, current_translation_type.name, e,
+                exc_info=True,
+            )
+            break  # Stop processing further cycles if one fails critically
+
+        # Reverse translation direction for the next cycle.
+        current_translation_type = (
+            TypeOfTranslation.fr_to_en
+            if current_translation_type == TypeOfTranslation.en_to_fr
+            else TypeOfTranslation.en_to_fr
+        )
 
+    suppressed = sum(reported_errors.values()) - len(reported_errors)
+    if suppressed:
+        logger.warning("Suppressed %d repeated cycle error message(s).", suppressed)
     logger.info("Finished all requested back-translation cycles.")
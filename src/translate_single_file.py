@@ -2,21 +2,72 @@
 Translates a single file using the specified model via OpenRouter API with rate limiting.
 """
 
+import asyncio
+import errno
 import os
+import re
+import functools
+import multiprocessing
+import random
 import shutil
 import logging
-from typing import Optional
-import requests
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Callable, Deque, Dict, Iterable, List, Optional, Tuple, Union
 
+from . import log_single_file
+from . import translation_cache
+from . import uring_reader
 from . import utils
 from .config import Config, TypeOfTranslation, DEFAULT_OPENROUTER_MODEL
 from .rate_limiter import wait_for_rate_limit
 
+if TYPE_CHECKING:
+    import requests
+
 # Configure logging for this module
 logger = logging.getLogger(__name__)
 
 OPENROUTER_API_URL = "https://openrouter.ai/api/v1/chat/completions"
 
+# Seconds before an OpenRouter request is abandoned.
+REQUEST_TIMEOUT = 120
+
+# Inputs larger than this are not sent to the API.
+MAX_TRANSLATE_BYTES = 256 * 1024
+
+# Shuffled filenames not yet handed out by _get_input_file, keyed by input directory.
+_POOL: Dict[str, Deque[str]] = {}
+
+# Set by _init_worker in each translate_n_files_parallel worker process.
+_worker_translator: Optional[Callable[[str], bool]] = None
+
+# Marks the start of each document in a batched prompt and its response.
+BATCH_MARKER_PATTERN = re.compile(r"^===DOC (\d+)===[ \t]*$", re.MULTILINE)
+
+_LANGUAGES = {
+    TypeOfTranslation.en_to_fr: ("English", "French"),
+    TypeOfTranslation.fr_to_en: ("French", "English"),
+}
+
+# The fixed instructions are sent as the system message, one per direction, so
+# every request starts with an identical prefix that providers with prompt
+# caching can serve from cache instead of billing it again.
+_SYSTEM_PROMPTS = {
+    translation_type: (
+        f"You are a translator. Translate the user text from {source} to {target} "
+        "verbatim without commentary."
+    )
+    for translation_type, (source, target) in _LANGUAGES.items()
+}
+_BATCH_SYSTEM_PROMPTS = {
+    translation_type: (
+        f"You are a translator. Translate each numbered {source} block in the user text to {target}. "
+        "Preserve the ===DOC k=== markers and output nothing else."
+    )
+    for translation_type, (source, target) in _LANGUAGES.items()
+}
+
 
 def translate_single_file(
     config: Config,
@@ -26,6 +77,9 @@ def translate_single_file(
     Translates a single file based on the provided configuration and cycle type
     using the OpenRouter API.
 
+    The input is moved to the completed directory unless the API request
+    failed or returned nothing; such files stay in the pool for a later cycle.
+
     Args:
         config: The configuration object, containing API key and model name.
         current_translation_type: The direction for this specific cycle.
@@ -35,23 +89,662 @@ def translate_single_file(
     input_filepath = os.path.join(config.get_input_dir(current_translation_type), input_filename)
 
     # Translate file directly from input pool to output pool
-    _translate_file_with_openrouter(config, input_filepath, input_filename, current_translation_type)
+    if not _translate_file_with_openrouter(config, input_filepath, input_filename, current_translation_type):
+        return
 
     # Move the original input file to completed directory
     _move_input_to_completed(config, current_translation_type, input_filename)
 
 
 def _get_input_file(config: Config, current_translation_type: TypeOfTranslation) -> str:
-    """Returns the filename of a random input file based on the translation type."""
+    """
+    Returns the filename of a random input file based on the translation type.
+
+    Files are served from an in-memory index of the input directory that is
+    shuffled when loaded and only rescanned once exhausted. Entries whose file
+    has disappeared since the scan are skipped.
+    """
+    input_dir = config.get_input_dir(current_translation_type)
+    pool = _POOL.setdefault(input_dir, deque())
+    if not pool:
+        logger.debug("Scanning input directory: %s", input_dir)
+        try:
+            filenames = utils.list_files_in_dir(input_dir)
+        except RuntimeError as e:
+            logger.error("Error getting input file: %s", e)
+            raise
+        random.shuffle(filenames)
+        pool.extend(filenames)
+
+    while pool:
+        filename = pool.popleft()
+        if os.path.isfile(os.path.join(input_dir, filename)):
+            logger.debug("Selected input file: %s", filename)
+            return filename
+        logger.debug("Skipping input file that is no longer in the pool: %s", filename)
+
+    logger.error("Error getting input file: No files found in directory: %s", input_dir)
+    raise RuntimeError(f"No files found in directory: {input_dir}")  # Stop the cycle if no input file found
+
+
+def _list_input_files(config: Config, current_translation_type: TypeOfTranslation) -> List[str]:
+    """
+    Returns the names of all files in the input pool for this direction.
+
+    Raises:
+        RuntimeError: If the input pool contains no files.
+    """
+    input_dir = config.get_input_dir(current_translation_type)
+    filenames = utils.list_files_in_dir(input_dir)
+    if not filenames:
+        logger.error("Error getting input files: No files found in directory: %s", input_dir)
+        raise RuntimeError(f"No files found in directory: {input_dir}")
+    return filenames
+
+
+def translate_batch(
+    config: Config,
+    current_translation_type: TypeOfTranslation,
+    batch_size: int = 16,
+) -> int:
+    """
+    Translates up to `batch_size` files from the input pool with a single
+    OpenRouter request.
+
+    The documents are concatenated into one prompt, each preceded by a
+    `===DOC k===` marker, and the response is split on the same markers.
+    A source file is only moved to the completed directory once its segment
+    has been parsed and written. If the request fails or a segment is
+    missing, the affected files get an OPENROUTER_* entry in the error log
+    and stay in the pool to be picked up again by a later cycle.
+
+    Args:
+        config: The configuration object, containing API key and model name.
+        current_translation_type: The direction for this specific cycle.
+        batch_size: Maximum number of files to send in one request.
+
+    Returns:
+        Number of files moved to the completed directory.
+
+    Raises:
+        RuntimeError: If the input pool contains no files.
+    """
     input_dir = config.get_input_dir(current_translation_type)
-    logger.info(f"Looking for input file in: {input_dir}")
     try:
-        filename = utils.get_random_file_from_dir(input_dir)
-        logger.info(f"Selected input file: {filename}")
-        return filename
+        filenames = utils.get_n_files_from_dir(input_dir, batch_size)
     except RuntimeError as e:
-        logger.error(f"Error getting input file: {e}")
-        raise  # Re-raise the error to stop the process if no input file found
+        logger.error("Error getting input files: %s", e)
+        raise
+
+    completed = 0
+    documents = []  # (filename, text) pairs that need an API translation
+    input_filepaths = [os.path.join(input_dir, input_filename) for input_filename in filenames]
+    raw_inputs = uring_reader.read_many(input_filepaths, MAX_TRANSLATE_BYTES)
+    for input_filename, input_filepath, raw in zip(filenames, input_filepaths, raw_inputs):
+        input_text = _decode_input_text(config, input_filepath, input_filename, current_translation_type, raw)
+        if input_text is None or _write_cached_translation(config, input_filename, current_translation_type, input_text):
+            # Empty, unreadable or already translated: output written, nothing to send.
+            _move_input_to_completed(config, current_translation_type, input_filename)
+            completed += 1
+            continue
+        documents.append((input_filename, input_text))
+
+    if not documents:
+        return completed
+
+    batch_text = _build_batch_text([text for _, text in documents])
+    try:
+        response_text = _request_completion(
+            config,
+            _BATCH_SYSTEM_PROMPTS[current_translation_type],
+            batch_text,
+            f"batch of {len(documents)} files",
+        )
+    except Exception as e:
+        logger.error("Error during OpenRouter API call for batch of %d files: %s", len(documents), e)
+        for input_filename, _ in documents:
+            _record_error(config, input_filename, current_translation_type, f"OPENROUTER_API_ERROR: {e}")
+        return completed
+
+    segments = _split_batch_response(response_text)
+    translated = []  # (filename, translation) pairs to flush together
+    for index, (input_filename, input_text) in enumerate(documents):
+        translation = segments.get(index)
+        if not translation:
+            logger.warning("No translation segment for %s in batch response; leaving it in the pool.", input_filename)
+            _record_error(config, input_filename, current_translation_type, "OPENROUTER_RESPONSE_EMPTY")
+            continue
+        _store_cached_translation(config, current_translation_type, input_text, translation)
+        translated.append((input_filename, translation))
+
+    completed += _flush_batch_outputs(config, current_translation_type, translated)
+
+    logger.info("Batch translation completed for %d of %d files.", completed, len(filenames))
+    return completed
+
+
+def translate_files_concurrent(
+    config: Config,
+    current_translation_type: TypeOfTranslation,
+    n_parallel: int = 8,
+) -> int:
+    """
+    Translates every file in the input pool, keeping up to `n_parallel`
+    OpenRouter requests in flight at once.
+
+    The pool is listed once up front. Each file is translated and moved to
+    the completed directory on a worker thread; a file whose task raises, or
+    whose API request failed, is left in the pool.
+
+    Args:
+        config: The configuration object, containing API key and model name.
+        current_translation_type: The direction for this specific cycle.
+        n_parallel: Maximum number of concurrent requests.
+
+    Returns:
+        Number of files moved to the completed directory.
+
+    Raises:
+        RuntimeError: If the input pool contains no files.
+    """
+    filenames = _list_input_files(config, current_translation_type)
+
+    translator = _make_translator(config, current_translation_type)
+    with ThreadPoolExecutor(max_workers=n_parallel) as executor:
+        futures = [
+            executor.submit(_run_translator, translator, input_filename)
+            for input_filename in filenames
+        ]
+        completed = _count_completed(future.result() for future in as_completed(futures))
+
+    logger.info("Concurrent translation completed for %d of %d files.", completed, len(filenames))
+    return completed
+
+
+def translate_files_async(
+    config: Config,
+    current_translation_type: TypeOfTranslation,
+    concurrency: int = 16,
+) -> int:
+    """
+    Translates every file in the input pool on one asyncio event loop,
+    keeping up to `concurrency` OpenRouter requests in flight.
+
+    All requests share a single aiohttp session, so connections are reused
+    across files instead of each worker thread holding its own. Each file is
+    moved to the completed directory once its task has finished without
+    raising, unless its API request failed. Falls back to
+    translate_files_concurrent if aiohttp is not installed.
+
+    Args:
+        config: The configuration object, containing API key and model name.
+        current_translation_type: The direction for this specific cycle.
+        concurrency: Maximum number of concurrent requests.
+
+    Returns:
+        Number of files moved to the completed directory.
+
+    Raises:
+        RuntimeError: If the input pool contains no files.
+    """
+    try:
+        import aiohttp
+    except ImportError:
+        logger.warning("aiohttp is not installed; falling back to threaded requests.")
+        return translate_files_concurrent(config, current_translation_type, n_parallel=concurrency)
+
+    filenames = _list_input_files(config, current_translation_type)
+
+    return asyncio.run(_translate_files_async(aiohttp, config, current_translation_type, filenames, concurrency))
+
+
+async def _translate_files_async(
+    aiohttp,
+    config: Config,
+    current_translation_type: TypeOfTranslation,
+    filenames: List[str],
+    concurrency: int,
+) -> int:
+    """Runs translate_files_async's tasks; returns the number of files moved."""
+    input_dir = config.get_input_dir(current_translation_type)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def translate_one(session, input_filename: str) -> bool:
+        async with semaphore:
+            input_text = _read_input_text(
+                config, os.path.join(input_dir, input_filename), input_filename, current_translation_type
+            )
+            if input_text is not None and not _write_cached_translation(
+                config, input_filename, current_translation_type, input_text
+            ):
+                try:
+                    translation = await _request_completion_async(
+                        session, config, _SYSTEM_PROMPTS[current_translation_type], input_text, input_filename
+                    )
+                except Exception as e:
+                    translation = e
+                if not _write_translation_result(
+                    config, input_filename, current_translation_type, input_text, translation
+                ):
+                    return False
+            _move_input_to_completed(config, current_translation_type, input_filename)
+            return True
+
+    async with aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=concurrency),
+        headers=_auth_headers(config.api_key),
+        timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
+    ) as session:
+        results = await asyncio.gather(
+            *(translate_one(session, input_filename) for input_filename in filenames),
+            return_exceptions=True,
+        )
+
+    return _count_completed(
+        (input_filename, False, result) if isinstance(result, Exception) else (input_filename, result, None)
+        for input_filename, result in zip(filenames, results)
+    )
+
+
+def translate_n_files_parallel(
+    config: Config,
+    current_translation_type: TypeOfTranslation,
+    n: int,
+) -> int:
+    """
+    Translates up to `n` files from the input pool in a pool of worker
+    processes, one file per task.
+
+    Each worker translates its file and moves it to the completed directory
+    itself, with the HTTP session and a translator for this direction set up
+    once when the process starts, so tasks only carry filenames. The rate
+    limiter is per process, so the combined request rate scales with the
+    number of workers (at most twice the CPU count).
+
+    Args:
+        config: The configuration object, containing API key and model name.
+        current_translation_type: The direction for this specific cycle.
+        n: Maximum number of files to translate.
+
+    Returns:
+        Number of files moved to the completed directory.
+
+    Raises:
+        RuntimeError: If the input pool contains no files.
+    """
+    filenames = _list_input_files(config, current_translation_type)
+    if len(filenames) > n:
+        filenames = random.sample(filenames, n)
+
+    processes = min(len(filenames), (os.cpu_count() or 1) * 2)
+    with multiprocessing.Pool(
+        processes=processes, initializer=_init_worker, initargs=(config, current_translation_type)
+    ) as pool:
+        return _count_completed(pool.imap_unordered(_translate_in_worker, filenames))
+
+
+def _init_worker(config: Config, current_translation_type: TypeOfTranslation) -> None:
+    """Sets up logging, the HTTP session and translator of a translate_n_files_parallel worker process."""
+    global _worker_translator
+    log_single_file.setup_worker_logging(config.log_filepath)
+    _get_session(config.api_key)
+    _worker_translator = _make_translator(config, current_translation_type)
+
+
+def _translate_in_worker(input_filename: str) -> Tuple[str, bool, Optional[str]]:
+    """Translates one file with this worker process's translator; see _run_translator."""
+    return _run_translator(_worker_translator, input_filename)
+
+
+def _run_translator(translator: Callable[[str], bool], input_filename: str) -> Tuple[str, bool, Optional[str]]:
+    """
+    Translates one file and moves it to the completed directory.
+
+    Returns:
+        The filename, whether it was moved, and, if the task failed, the
+        error message. Errors are returned as text because not every
+        exception can be pickled back to the parent process.
+    """
+    try:
+        done = translator(input_filename)
+    except Exception as e:
+        return input_filename, False, str(e)
+    return input_filename, done, None
+
+
+def _count_completed(results: Iterable[Tuple[str, bool, Optional[object]]]) -> int:
+    """
+    Returns how many of a driver's files were moved to the completed
+    directory, logging each task that failed.
+
+    Args:
+        results: The filename, whether it was moved, and the task's error
+            (None unless it raised) for each file.
+    """
+    completed = 0
+    for input_filename, done, error in results:
+        if error is not None:
+            logger.error("Translation of %s failed; leaving it in the pool: %s", input_filename, error)
+            continue
+        completed += done
+    return completed
+
+
+def _make_translator(
+    config: Config,
+    current_translation_type: TypeOfTranslation,
+) -> Callable[[str], bool]:
+    """
+    Returns a function that translates one input file, given its name, and
+    moves it to the completed directory. The function returns False, leaving
+    the file in the pool, if the API request failed or returned nothing.
+
+    The directories depend only on the direction, so they are resolved (and
+    created) once here instead of for every file a driver hands out.
+    """
+    input_dir = config.get_input_dir(current_translation_type)
+    completed_dir = config.get_completed_dir(current_translation_type)
+    _ensure_dir(config.get_output_dir(current_translation_type))
+    _ensure_dir(completed_dir)
+
+    def translate(input_filename: str) -> bool:
+        input_filepath = os.path.join(input_dir, input_filename)
+        if not _translate_file_with_openrouter(config, input_filepath, input_filename, current_translation_type):
+            return False
+        _move_file(input_filepath, os.path.join(completed_dir, input_filename))
+        return True
+
+    return translate
+
+
+def _flush_batch_outputs(
+    config: Config,
+    current_translation_type: TypeOfTranslation,
+    translated: List[Tuple[str, str]],
+) -> int:
+    """
+    Writes the translations of a batch and moves their inputs to the
+    completed directory, as one io_uring submission when available.
+
+    Each input is only moved once its output has been written; inputs whose
+    output could not be written stay in the pool.
+
+    Returns:
+        Number of inputs moved to the completed directory.
+    """
+    if not translated:
+        return 0
+    input_dir = config.get_input_dir(current_translation_type)
+    output_dir = config.get_output_dir(current_translation_type)
+    completed_dir = config.get_completed_dir(current_translation_type)
+    _ensure_dir(output_dir)
+    _ensure_dir(completed_dir)
+
+    results = uring_reader.write_many(
+        [os.path.join(output_dir, input_filename) for input_filename, _ in translated],
+        [translation.encode("utf-8") for _, translation in translated],
+        [
+            (os.path.join(input_dir, input_filename), os.path.join(completed_dir, input_filename))
+            for input_filename, _ in translated
+        ],
+    )
+
+    completed = 0
+    for (input_filename, _), (write_error, rename_error) in zip(translated, results):
+        if write_error is not None:
+            logger.error("Error writing output file %s: %s", os.path.join(output_dir, input_filename), write_error)
+            continue
+        if rename_error is not None:
+            # e.g. EXDEV when the pools are on different filesystems.
+            _move_input_to_completed(config, current_translation_type, input_filename)
+        completed += 1
+    return completed
+
+
+def _build_batch_text(texts: List[str]) -> str:
+    """Joins the texts of a batch, each preceded by its `===DOC k===` marker."""
+    return "\n".join(f"===DOC {index}===\n{text}" for index, text in enumerate(texts))
+
+
+def _split_batch_response(response_text: str) -> Dict[int, str]:
+    """
+    Splits a batch response on its `===DOC k===` markers.
+
+    Returns:
+        Mapping of document index to stripped translation. Indices whose
+        marker is absent from the response are omitted.
+    """
+    segments: Dict[int, str] = {}
+    matches = list(BATCH_MARKER_PATTERN.finditer(response_text))
+    for match, next_match in zip(matches, matches[1:] + [None]):
+        end = next_match.start() if next_match else len(response_text)
+        segments[int(match.group(1))] = response_text[match.end():end].strip()
+    return segments
+
+
+def _read_input_text(
+    config: Config,
+    input_filepath: str,
+    input_filename: str,
+    current_translation_type: TypeOfTranslation
+) -> Optional[str]:
+    """
+    Reads the text of an input file.
+
+    Returns:
+        The file contents, or None if there is nothing to translate. In that
+        case an empty output file or an error-log entry has already been written.
+    """
+    try:
+        raw: Union[bytes, OSError] = uring_reader.read_file(input_filepath, MAX_TRANSLATE_BYTES)
+    except OSError as e:
+        raw = e
+    return _decode_input_text(config, input_filepath, input_filename, current_translation_type, raw)
+
+
+def _decode_input_text(
+    config: Config,
+    input_filepath: str,
+    input_filename: str,
+    current_translation_type: TypeOfTranslation,
+    raw: Union[bytes, OSError]
+) -> Optional[str]:
+    """
+    Decodes the raw contents of an input file, or records why it could not be read.
+
+    Args:
+        raw: The file's bytes, or the OSError raised while reading it.
+
+    Returns:
+        The decoded text, or None if there is nothing to translate. In that
+        case an empty output file or an error-log entry has already been written.
+    """
+    if isinstance(raw, uring_reader.FileTooLargeError):
+        logger.error("Input file %s is %d bytes, above the %d byte limit. Skipping translation.",
+                     input_filename, raw.size, MAX_TRANSLATE_BYTES)
+        _record_error(config, input_filename, current_translation_type, f"FILE_TOO_LARGE: {raw.size} bytes")
+        return None
+    if isinstance(raw, FileNotFoundError):
+        logger.error("Input file not found at %s during translation attempt.", input_filepath)
+        _record_error(config, input_filename, current_translation_type, f"FILE_NOT_FOUND_ERROR: {input_filepath}")
+        return None
+    try:
+        if isinstance(raw, OSError):
+            raise raw
+        input_text = raw.decode("utf-8")
+    except Exception as e:
+        logger.error("Error reading input file %s: %s", input_filepath, e)
+        _record_error(config, input_filename, current_translation_type, f"FILE_READ_ERROR: {e}")
+        return None
+
+    if not input_text.strip():
+        logger.warning("Input file %s is empty or contains only whitespace. Skipping translation.", input_filename)
+        _write_translation_output(config, input_filename, current_translation_type, "")  # Write empty file for empty input
+        return None
+    return input_text
+
+
+@functools.lru_cache(maxsize=4)
+def _get_session(api_key: str) -> "requests.Session":
+    """
+    Returns a shared HTTP session carrying the OpenRouter auth headers.
+
+    Reusing the session keeps connections alive across requests instead of
+    paying a new TCP/TLS handshake per file. Sessions are cached per API key,
+    so a different key gets its own session; call `_get_session.cache_clear()`
+    to drop them.
+
+    requests is imported here rather than at module level, so importing
+    this module (e.g. to log a cycle or inspect a pool) does not load it.
+    """
+    import requests
+
+    session = requests.Session()
+    session.headers.update(_auth_headers(api_key))
+    return session
+
+
+def _auth_headers(api_key: str) -> Dict[str, str]:
+    """Returns the headers sent with every OpenRouter request."""
+    return {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json",
+    }
+
+
+@functools.lru_cache(maxsize=64)
+def _ensure_dir(path: str) -> None:
+    """
+    Creates `path` if needed, once per process.
+
+    The pool directories do not change during a run, so only the first call
+    for each path touches the filesystem. Failures are not cached. Call
+    `_ensure_dir.cache_clear()` if a directory may have been removed.
+    """
+    os.makedirs(path, exist_ok=True)
+
+
+def _get_model_name(config: Config) -> str:
+    """Returns the model to use for requests, falling back to the default."""
+    return config.resolved_model_name if config.resolved_model_name else DEFAULT_OPENROUTER_MODEL
+
+
+def _write_cached_translation(
+    config: Config,
+    input_filename: str,
+    current_translation_type: TypeOfTranslation,
+    input_text: str
+) -> bool:
+    """
+    Writes the output from the translation cache if it holds this text.
+
+    Returns:
+        True on a cache hit (output written), False on a miss or if caching is disabled.
+    """
+    if not config.cache_dir:
+        return False
+    key = translation_cache.make_key(current_translation_type, _get_model_name(config), input_text)
+    translation = translation_cache.get(config.cache_dir, key)
+    if translation is None:
+        return False
+    logger.info("Translation cache hit for file: %s", input_filename)
+    _write_translation_output(config, input_filename, current_translation_type, translation)
+    return True
+
+
+def _store_cached_translation(
+    config: Config,
+    current_translation_type: TypeOfTranslation,
+    input_text: str,
+    translation: str
+) -> None:
+    """Stores a successful translation in the cache, if caching is enabled."""
+    if not config.cache_dir:
+        return
+    key = translation_cache.make_key(current_translation_type, _get_model_name(config), input_text)
+    translation_cache.put(config.cache_dir, key, translation)
+
+
+def _request_completion(config: Config, system_prompt: str, text: str, request_label: str) -> str:
+    """
+    Sends one chat-completion request to OpenRouter, applying rate limiting.
+
+    Args:
+        config: The configuration object (contains API key, model name).
+        system_prompt: The fixed instruction for this kind of request.
+        text: The text to translate, sent as the user message.
+        request_label: Description of the request used in log messages.
+
+    Returns:
+        The stripped content of the first choice, or "" if the response had none.
+
+    Raises:
+        RuntimeError: If the API responds with a non-200 status.
+        requests.RequestException: If the HTTP request fails.
+    """
+    model_name = _get_model_name(config)
+    logger.debug("Using model: %s", model_name)
+
+    # Apply rate limiting before API call
+    waited = wait_for_rate_limit()
+    if waited:
+        logger.debug("Rate limit applied, waited before API call for: %s", request_label)
+
+    logger.debug("Sending request to OpenRouter API for: %s", request_label)
+
+    payload = _build_payload(model_name, system_prompt, text)
+    resp = _get_session(config.api_key).post(OPENROUTER_API_URL, json=payload, timeout=REQUEST_TIMEOUT)
+
+    if resp.status_code != 200:
+        raise RuntimeError(f"OpenRouter API error {resp.status_code}: {resp.text[:500]}")
+
+    return _extract_content(resp.json())
+
+
+async def _request_completion_async(session, config: Config, system_prompt: str, text: str, request_label: str) -> str:
+    """
+    Sends one chat-completion request to OpenRouter over an aiohttp session.
+
+    Same contract as _request_completion. The blocking rate limiter runs in
+    a worker thread so that waiting does not stall the event loop.
+    """
+    model_name = _get_model_name(config)
+    waited = await asyncio.to_thread(wait_for_rate_limit)
+    if waited:
+        logger.debug("Rate limit applied, waited before API call for: %s", request_label)
+
+    logger.debug("Sending request to OpenRouter API for: %s", request_label)
+
+    payload = _build_payload(model_name, system_prompt, text)
+    async with session.post(OPENROUTER_API_URL, json=payload) as resp:
+        if resp.status != 200:
+            raise RuntimeError(f"OpenRouter API error {resp.status}: {(await resp.text())[:500]}")
+        data = await resp.json(content_type=None)
+
+    return _extract_content(data)
+
+
+def _build_payload(model_name: str, system_prompt: str, text: str) -> Dict:
+    """Returns the chat-completion request body for one text."""
+    return {
+        "model": model_name,
+        "messages": [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": text},
+        ],
+        "temperature": 0.0,
+    }
+
+
+def _extract_content(data) -> str:
+    """Returns the stripped content of the first choice, or "" if the response had none."""
+    # One lookup chain instead of probing each level; a response without a
+    # first choice or message content counts as empty.
+    try:
+        content = data["choices"][0]["message"]["content"]
+    except (KeyError, IndexError, TypeError):
+        return ""
+    return (content or "").strip()
 
 
 def _translate_file_with_openrouter(
@@ -59,7 +752,7 @@ def _translate_file_with_openrouter(
     input_filepath: str,
     input_filename: str,  # Needed for output filename
     current_translation_type: TypeOfTranslation
-) -> None:
+) -> bool:
     """
     Performs the translation using the OpenRouter API.
     Reads directly from the input file path and writes directly to the final output path.
@@ -69,80 +762,85 @@ def _translate_file_with_openrouter(
         input_filepath: Full path to the input file in the source pool.
         input_filename: Original filename (used for output).
         current_translation_type: The direction for this cycle.
+
+    Returns:
+        True if the input is done with and can be moved to the completed
+        directory, False if the API request failed or returned nothing.
     """
-    logger.info(f"Translating file using OpenRouter: {input_filepath}")
+    logger.debug("Translating file using OpenRouter: %s", input_filepath)
 
-    # 1. Resolve model name
-    model_name = config.resolved_model_name if config.resolved_model_name else DEFAULT_OPENROUTER_MODEL
-    logger.info(f"Using model: {model_name}")
+    # 1. Read Input Text
+    input_text = _read_input_text(config, input_filepath, input_filename, current_translation_type)
+    if input_text is None:
+        return True
+    if _write_cached_translation(config, input_filename, current_translation_type, input_text):
+        return True
 
-    # 2. Read Input Text
+    # 2. Call OpenRouter API with rate limiting
     try:
-        with open(input_filepath, "r", encoding='utf-8') as f:
-            input_text = f.read()
-        if not input_text.strip():
-            logger.warning(f"Input file {input_filename} is empty or contains only whitespace. Skipping translation.")
-            translation = ""  # Write empty file for empty input
-            _write_translation_output(config, input_filename, current_translation_type, translation)
-            return
-    except FileNotFoundError:
-        logger.error(f"Input file not found at {input_filepath} during translation attempt.")
-        _write_translation_output(config, input_filename, current_translation_type, f"FILE_NOT_FOUND_ERROR: {input_filepath}")
-        return
+        translation = _request_completion(
+            config, _SYSTEM_PROMPTS[current_translation_type], input_text, input_filename
+        )
     except Exception as e:
-        logger.error(f"Error reading input file {input_filepath}: {e}")
-        _write_translation_output(config, input_filename, current_translation_type, f"FILE_READ_ERROR: {e}")
-        return
+        translation = e
 
-    # 3. Construct Prompt
-    source_lang = "English" if current_translation_type == TypeOfTranslation.en_to_fr else "French"
-    target_lang = "French" if current_translation_type == TypeOfTranslation.en_to_fr else "English"
-    prompt = f"Translate the following {source_lang} text to {target_lang}:\n\n{input_text}"
+    # 3. Write Output
+    return _write_translation_result(config, input_filename, current_translation_type, input_text, translation)
 
-    # 4. Call OpenRouter API with rate limiting
-    translation = ""
-    try:
-        # Apply rate limiting before API call
-        waited = wait_for_rate_limit()
-        if waited:
-            logger.info(f"Rate limit applied, waited before API call for file: {input_filename}")
-
-        logger.info(f"Sending request to OpenRouter API for file: {input_filename}")
-
-        headers = {
-            "Authorization": f"Bearer {config.api_key}",
-            "Content-Type": "application/json",
-        }
-        payload = {
-            "model": model_name,
-            "messages": [{"role": "user", "content": prompt}],
-            "temperature": 0.0,
-        }
-
-        resp = requests.post(OPENROUTER_API_URL, headers=headers, json=payload, timeout=120)
-
-        if resp.status_code != 200:
-            error_msg = f"OpenRouter API error {resp.status_code}: {resp.text[:500]}"
-            logger.error(f"Error during OpenRouter API call for {input_filename}: {error_msg}")
-            translation = f"OPENROUTER_API_ERROR: {error_msg}"
-        else:
-            data = resp.json()
-            choices = data.get("choices", [])
-            if choices:
-                translation = (choices[0].get("message", {}).get("content") or "").strip()
-
-            if translation:
-                logger.info(f"Translation successful for file: {input_filename}")
-            else:
-                logger.warning(f"OpenRouter response for {input_filename} was empty.")
-                translation = "OPENROUTER_RESPONSE_EMPTY"
 
-    except Exception as e:
-        logger.error(f"Error during OpenRouter API call for {input_filename}: {e}")
-        translation = f"OPENROUTER_API_ERROR: {e}"
+def _write_translation_result(
+    config: Config,
+    input_filename: str,
+    current_translation_type: TypeOfTranslation,
+    input_text: str,
+    translation: Union[str, Exception],
+) -> bool:
+    """
+    Writes the outcome of one API request.
+
+    A successful translation goes to the output file and the cache; an
+    empty response or a request error is recorded as an OPENROUTER_* marker
+    in the error log instead.
 
-    # 5. Write Output
+    Returns:
+        True if a translation was written, False if a failure was recorded
+        and the input should stay in the pool.
+    """
+    if isinstance(translation, Exception):
+        logger.error("Error during OpenRouter API call for %s: %s", input_filename, translation)
+        _record_error(config, input_filename, current_translation_type, f"OPENROUTER_API_ERROR: {translation}")
+        return False
+    if not translation:
+        logger.warning("OpenRouter response for %s was empty.", input_filename)
+        _record_error(config, input_filename, current_translation_type, "OPENROUTER_RESPONSE_EMPTY")
+        return False
+    logger.info("Translation successful for file: %s", input_filename)
+    _store_cached_translation(config, current_translation_type, input_text, translation)
     _write_translation_output(config, input_filename, current_translation_type, translation)
+    return True
+
+
+def _record_error(
+    config: Config,
+    input_filename: str,
+    current_translation_type: TypeOfTranslation,
+    marker: str
+) -> None:
+    """
+    Appends a failure marker for one input file to the error log.
+
+    Failures share one append-only file instead of each writing its own
+    output file, so a run of fast failures costs one write apiece and error
+    text never lands in the next cycle's input pool. Each line holds the
+    direction, the filename and the marker, separated by tabs.
+    """
+    error_log_path = config.error_log_filepath
+    line = "\t".join((current_translation_type.name, input_filename, " ".join(marker.splitlines())))
+    try:
+        _ensure_dir(os.path.dirname(error_log_path))
+        utils.append_line(error_log_path, line)
+    except OSError as e:
+        logger.error("Error writing to error log %s: %s", error_log_path, e)
 
 
 def _write_translation_output(
@@ -151,20 +849,20 @@ def _write_translation_output(
     current_translation_type: TypeOfTranslation,
     translation: str
 ) -> None:
-    """Helper function to write the translation (or error message) to the output file."""
+    """Helper function to write the translation to the output file."""
     output_dir_path = config.get_output_dir(current_translation_type)
     final_translated_path = os.path.join(output_dir_path, input_filename)  # Output uses original filename
 
     # Ensure output directory exists
-    os.makedirs(output_dir_path, exist_ok=True)
+    _ensure_dir(output_dir_path)
 
-    # Write the translation/error directly to the final output file
-    logger.info(f"Writing output to: {final_translated_path}")
+    # Write the translation directly to the final output file
+    logger.debug("Writing output to: %s", final_translated_path)
     try:
         with open(final_translated_path, "w", encoding='utf-8') as f:
             f.write(translation)
     except Exception as e:
-        logger.error(f"Error writing output file {final_translated_path}: {e}")
+        logger.error("Error writing output file %s: %s", final_translated_path, e)
         # Log the error, but the process might continue with the next file
 
 
@@ -194,18 +892,37 @@ def _move_input_to_completed(
 
     # Ensure completed directory exists
     try:
-        os.makedirs(completed_dir_path, exist_ok=True)
+        _ensure_dir(completed_dir_path)
     except OSError as e:
-        logger.error(f"Failed to create completed directory '{completed_dir_path}': {e}")
+        logger.error("Failed to create completed directory '%s': %s", completed_dir_path, e)
         raise
 
-    # Move original input file to completed
-    if os.path.exists(original_input_path):
-        logger.info(f"Moving {original_input_path} to {completed_input_path}")
+    _move_file(original_input_path, completed_input_path)
+
+
+def _move_file(original_input_path: str, completed_input_path: str) -> None:
+    """
+    Moves an input file to its path in the (existing) completed directory.
+
+    Raises:
+        OSError: If file cannot be moved
+    """
+    # Move original input file to completed. Both pools normally share a
+    # filesystem, where a rename is a single metadata update; shutil.move
+    # (copy + delete) is only needed across devices.
+    logger.debug("Moving %s to %s", original_input_path, completed_input_path)
+    try:
         try:
+            os.rename(original_input_path, completed_input_path)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
             shutil.move(original_input_path, completed_input_path)
-        except Exception as e:
-            logger.error(f"Error moving file {original_input_path} to {completed_input_path}: {e}")
-            raise OSError(f"Failed to move file '{original_input_path}' to '{completed_input_path}': {e}") from e
-    else:
-        logger.warning(f"Original input file {original_input_path} not found for moving (might have been processed already or deleted).")
+    except Exception as e:
+        # A missing completed directory raises the same error as a missing
+        # source; only the latter means there is nothing left to move.
+        if isinstance(e, FileNotFoundError) and not os.path.lexists(original_input_path):
+            logger.warning("Original input file %s not found for moving (might have been processed already or deleted).", original_input_path)
+            return
+        logger.error("Error moving file %s to %s: %s", original_input_path, completed_input_path, e)
+        raise OSError(f"Failed to move file '{original_input_path}' to '{completed_input_path}': {e}") from e
@@ -0,0 +1,88 @@
+"""
+Persistent content-addressed cache of completed translations.
+
+Entries are stored as individual UTF-8 files sharded by the first two hex
+digits of their key: `<cache_dir>/<key[:2]>/<key>.txt`.
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+from typing import Optional
+
+from .config import TypeOfTranslation
+
+# Configure logging for this module
+logger = logging.getLogger(__name__)
+
+
+def make_key(translation_type: TypeOfTranslation, model_name: str, text: str) -> str:
+    """
+    Builds the cache key for a translation request.
+
+    Args:
+        translation_type: Direction of the translation
+        model_name: Model used to produce the translation
+        text: Source text
+
+    Returns:
+        32-character hex digest identifying the request
+    """
+    material = f"{translation_type.value}|{model_name}|{text}".encode("utf-8")
+    return hashlib.blake2b(material, digest_size=16).hexdigest()
+
+
+def _entry_path(cache_dir: str, key: str) -> str:
+    """Returns the file path of the cache entry for a key."""
+    return os.path.join(cache_dir, key[:2], f"{key}.txt")
+
+
+def get(cache_dir: str, key: str) -> Optional[str]:
+    """
+    Looks up a cached translation.
+
+    Args:
+        cache_dir: Root directory of the cache
+        key: Key produced by make_key
+
+    Returns:
+        The cached translation, or None on a miss or unreadable entry
+    """
+    try:
+        with open(_entry_path(cache_dir, key), "r", encoding="utf-8") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+    except OSError as e:
+        logger.warning("Cannot read translation cache entry %s: %s", key, e)
+        return None
+
+
+def put(cache_dir: str, key: str, value: str) -> None:
+    """
+    Stores a translation in the cache.
+
+    The entry is written to a temporary file and renamed into place, so
+    concurrent readers never see a partial entry. Failures are logged and
+    otherwise ignored since the cache is only an optimization.
+
+    Args:
+        cache_dir: Root directory of the cache
+        key: Key produced by make_key
+        value: Translation to store
+    """
+    entry_path = _entry_path(cache_dir, key)
+    shard_dir = os.path.dirname(entry_path)
+    try:
+        os.makedirs(shard_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=shard_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(value)
+            os.replace(tmp_path, entry_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError as e:
+        logger.warning("Cannot write translation cache entry %s: %s", key, e)
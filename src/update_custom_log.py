@@ -21,6 +21,8 @@ def update_custom_log(
         name: The name of the metric.
     """
     # Log using standard INFO level. The actual handler (file/console) is configured elsewhere.
-    logger.info(f"Metric - Step: {x}, Name: {name}, Value: {y}")
+    # The message is only formatted if INFO records are actually emitted.
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Metric - Step: %d, Name: %s, Value: %s", x, name, y)
 
 # Removed dependency on log_dir as configuration is handled globally.
@@ -0,0 +1,320 @@
+"""
+Batched file reads and writes, submitted through io_uring on Linux when available.
+
+The io_uring path needs the optional `liburing` package and a kernel that
+supports the operations used: reads and writes need 5.6+, linked renames
+5.11+. Without them, or if the ring cannot be set up, files are processed
+one by one with ordinary blocking calls.
+"""
+
+import errno
+import logging
+import os
+import sys
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+# Configure logging for this module
+logger = logging.getLogger(__name__)
+
+READ_BUFFER_SIZE = 4096
+RING_ENTRIES = 256
+
+_liburing = None
+_liburing_checked = False
+_supported_ops: Dict[str, bool] = {}
+
+# Result of write_many for one file: (write error, rename error); None means success.
+WriteResult = Tuple[Optional[OSError], Optional[OSError]]
+
+
+class FileTooLargeError(OSError):
+    """Raised when a file is larger than the caller's size limit."""
+
+    def __init__(self, path: str, size: int, max_size: int):
+        super().__init__(errno.EFBIG, f"File is {size} bytes, above the {max_size} byte limit", path)
+        self.size = size
+
+
+def _get_liburing(*required_ops: str):
+    """
+    Returns the liburing module, or None if io_uring cannot be used or the
+    running kernel lacks any of `required_ops` (e.g. "IORING_OP_READ").
+    """
+    global _liburing, _liburing_checked, _supported_ops
+    if not _liburing_checked:
+        _liburing_checked = True
+        if sys.platform == "linux":
+            try:
+                import liburing
+                _supported_ops = liburing.probe() or {}
+                _liburing = liburing
+            except ImportError:
+                logger.debug("liburing is not installed; using blocking I/O.")
+            except OSError as e:
+                logger.debug("io_uring is not available (%s); using blocking I/O.", e)
+    if _liburing is None or not all(_supported_ops.get(op) for op in required_ops):
+        return None
+    return _liburing
+
+
+def _check_size(path: str, size: int, max_size: Optional[int]) -> None:
+    """Raises FileTooLargeError if `size` exceeds `max_size`."""
+    if max_size is not None and size > max_size:
+        raise FileTooLargeError(path, size, max_size)
+
+
+def read_file(path: str, max_size: Optional[int] = None) -> bytes:
+    """
+    Reads a whole file with a blocking read.
+
+    Args:
+        path: Path of the file to read
+        max_size: Largest accepted file size in bytes, or None for no limit
+
+    Returns:
+        The file contents
+
+    Raises:
+        FileTooLargeError: If the file is larger than max_size
+        OSError: If the file cannot be opened or read
+    """
+    with open(path, "rb", buffering=READ_BUFFER_SIZE) as f:
+        _check_size(path, os.fstat(f.fileno()).st_size, max_size)
+        return f.read()
+
+
+def read_many(paths: Sequence[str], max_size: Optional[int] = None) -> List[Union[bytes, OSError]]:
+    """
+    Reads several whole files, in one io_uring submission when possible.
+
+    Args:
+        paths: Paths of the files to read
+        max_size: Largest accepted file size in bytes, or None for no limit
+
+    Returns:
+        One result per path, in order: the file contents, or the OSError
+        (including FileTooLargeError) that prevented reading it.
+    """
+    global _liburing
+    liburing = _get_liburing("IORING_OP_READ")
+    if liburing is not None and len(paths) > 1:
+        try:
+            return _read_many_uring(liburing, paths, max_size)
+        except OSError as e:
+            # e.g. io_uring disabled by the kernel or a seccomp policy; don't retry.
+            logger.warning("io_uring is unavailable (%s); falling back to blocking reads.", e)
+            _liburing = None
+
+    results: List[Union[bytes, OSError]] = []
+    for path in paths:
+        try:
+            results.append(read_file(path, max_size))
+        except OSError as e:
+            results.append(e)
+    return results
+
+
+def _read_many_uring(liburing, paths: Sequence[str], max_size: Optional[int]) -> List[Union[bytes, OSError]]:
+    """
+    Reads files by queueing one read per file and submitting each group of
+    up to RING_ENTRIES reads with a single io_uring_enter call.
+
+    Raises:
+        OSError: If the ring cannot be created.
+    """
+    results: List[Union[bytes, OSError]] = [b""] * len(paths)
+    ring = liburing.Ring()
+    cqe = liburing.Cqe()
+    liburing.io_uring_queue_init(RING_ENTRIES, ring)
+    try:
+        for start in range(0, len(paths), RING_ENTRIES):
+            pending = {}  # index -> (fd, buffer)
+            try:
+                for index in range(start, min(start + RING_ENTRIES, len(paths))):
+                    try:
+                        fd = os.open(paths[index], os.O_RDONLY | os.O_CLOEXEC)
+                    except OSError as e:
+                        results[index] = e
+                        continue
+                    try:
+                        size = os.fstat(fd).st_size
+                        _check_size(paths[index], size, max_size)
+                    except OSError as e:
+                        os.close(fd)
+                        results[index] = e
+                        continue
+                    buffer = bytearray(size)
+                    pending[index] = (fd, buffer)
+                    sqe = liburing.io_uring_get_sqe(ring)
+                    liburing.io_uring_prep_read(sqe, fd, buffer, 0)
+                    liburing.io_uring_sqe_set_data64(sqe, index)
+
+                if pending:
+                    liburing.io_uring_submit(ring)
+                for _ in range(len(pending)):
+                    liburing.io_uring_wait_cqe(ring, cqe)
+                    entry = cqe[0]
+                    index = entry.user_data
+                    try:
+                        count = entry.res  # raises the errno of a failed read
+                    except OSError as e:
+                        results[index] = OSError(e.errno, e.strerror, paths[index])
+                    else:
+                        fd, buffer = pending[index]
+                        if count < len(buffer):
+                            # Short read (e.g. the file shrank); finish synchronously.
+                            del buffer[count:]
+                            buffer += _read_to_end(fd, count)
+                        results[index] = bytes(buffer)
+                    liburing.io_uring_cqe_seen(ring, entry)
+            finally:
+                for fd, _ in pending.values():
+                    os.close(fd)
+    finally:
+        liburing.io_uring_queue_exit(ring)
+    return results
+
+
+def _read_to_end(fd: int, offset: int) -> bytes:
+    """Reads from `offset` until end of file with blocking preads."""
+    chunks = []
+    while True:
+        chunk = os.pread(fd, READ_BUFFER_SIZE, offset)
+        if not chunk:
+            return b"".join(chunks)
+        chunks.append(chunk)
+        offset += len(chunk)
+
+
+def write_many(
+    paths: Sequence[str],
+    buffers: Sequence[bytes],
+    renames: Optional[Sequence[Optional[Tuple[str, str]]]] = None,
+) -> List[WriteResult]:
+    """
+    Writes each buffer to its path (created or truncated), each optionally
+    followed by a rename that only runs once that write has succeeded.
+
+    With io_uring, every write is linked (IOSQE_IO_LINK) to its rename and
+    each group of up to RING_ENTRIES operations goes out in one submission.
+
+    Args:
+        paths: Paths of the files to write
+        buffers: Data to write, one buffer per path
+        renames: Optional (source, destination) rename per path, or None
+
+    Returns:
+        One (write_error, rename_error) pair per path, where None means
+        success. rename_error is None when no rename was requested, and
+        ECANCELED when the rename was skipped because the write failed.
+    """
+    global _liburing
+    if renames is None:
+        renames = [None] * len(paths)
+    liburing = _get_liburing("IORING_OP_WRITE", "IORING_OP_RENAMEAT")
+    if liburing is not None and len(paths) > 1:
+        try:
+            return _write_many_uring(liburing, paths, buffers, renames)
+        except OSError as e:
+            logger.warning("io_uring is unavailable (%s); falling back to blocking writes.", e)
+            _liburing = None
+
+    results: List[WriteResult] = []
+    for path, buffer, rename in zip(paths, buffers, renames):
+        try:
+            with open(path, "wb") as f:
+                f.write(buffer)
+        except OSError as e:
+            results.append((e, _cancelled(rename)))
+            continue
+        if rename is None:
+            results.append((None, None))
+            continue
+        try:
+            os.rename(*rename)
+        except OSError as e:
+            results.append((None, e))
+        else:
+            results.append((None, None))
+    return results
+
+
+def _cancelled(rename: Optional[Tuple[str, str]]) -> Optional[OSError]:
+    """Returns the error reported for a rename skipped because its write failed."""
+    if rename is None:
+        return None
+    return OSError(errno.ECANCELED, "Rename skipped because the write failed", rename[0])
+
+
+def _write_many_uring(
+    liburing,
+    paths: Sequence[str],
+    buffers: Sequence[bytes],
+    renames: Sequence[Optional[Tuple[str, str]]],
+) -> List[WriteResult]:
+    """
+    Queues a write per file, linked to its rename, and submits each group
+    with a single io_uring_enter call. user_data is 2*index for a write and
+    2*index + 1 for its rename.
+
+    Raises:
+        OSError: If the ring cannot be created.
+    """
+    write_errors: List[Optional[OSError]] = [None] * len(paths)
+    rename_errors: List[Optional[OSError]] = [None] * len(paths)
+    ring = liburing.Ring()
+    cqe = liburing.Cqe()
+    liburing.io_uring_queue_init(RING_ENTRIES, ring)
+    try:
+        group_size = RING_ENTRIES // 2  # up to two SQEs per file
+        for start in range(0, len(paths), group_size):
+            fds = {}  # index -> fd
+            queued = 0
+            try:
+                for index in range(start, min(start + group_size, len(paths))):
+                    try:
+                        fd = os.open(paths[index], os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_CLOEXEC, 0o666)
+                    except OSError as e:
+                        write_errors[index] = e
+                        rename_errors[index] = _cancelled(renames[index])
+                        continue
+                    fds[index] = fd
+                    sqe = liburing.io_uring_get_sqe(ring)
+                    liburing.io_uring_prep_write(sqe, fd, buffers[index], 0)
+                    liburing.io_uring_sqe_set_data64(sqe, 2 * index)
+                    queued += 1
+                    if renames[index] is not None:
+                        liburing.io_uring_sqe_set_flags(sqe, liburing.IOSQE_IO_LINK)
+                        sqe = liburing.io_uring_get_sqe(ring)
+                        liburing.io_uring_prep_rename(sqe, *renames[index])
+                        liburing.io_uring_sqe_set_data64(sqe, 2 * index + 1)
+                        queued += 1
+
+                if queued:
+                    liburing.io_uring_submit(ring)
+                for _ in range(queued):
+                    liburing.io_uring_wait_cqe(ring, cqe)
+                    entry = cqe[0]
+                    index, is_rename = divmod(entry.user_data, 2)
+                    try:
+                        count = entry.res  # raises the errno of a failed operation
+                    except OSError as e:
+                        path = renames[index][0] if is_rename else paths[index]
+                        error = OSError(e.errno, e.strerror, path)
+                        if is_rename:
+                            rename_errors[index] = error
+                        else:
+                            write_errors[index] = error
+                    else:
+                        if not is_rename and count < len(buffers[index]):
+                            # A short write also cancels the linked rename.
+                            write_errors[index] = OSError(
+                                errno.EIO, f"Short write ({count} of {len(buffers[index])} bytes)", paths[index]
+                            )
+                    liburing.io_uring_cqe_seen(ring, entry)
+            finally:
+                for fd in fds.values():
+                    os.close(fd)
+    finally:
+        liburing.io_uring_queue_exit(ring)
+    return list(zip(write_errors, rename_errors))
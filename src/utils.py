@@ -2,17 +2,37 @@
 Utility functions with comprehensive type hints and error handling.
 """
 
+import atexit
+import functools
 import subprocess
 import os
 import random
-from typing import List, Optional
+import shlex
+import threading
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 
+# Default working directory for sh(): the directory containing this file.
+_SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Descriptors opened by append_line, keyed by path; closed at exit.
+_APPEND_FDS: Dict[str, int] = {}
+_APPEND_FDS_LOCK = threading.Lock()
+
+
+@functools.lru_cache(maxsize=256)
+def _tokenize(command: str) -> Tuple[str, ...]:
+    """Splits a command with shell quoting rules, caching the result for repeated commands."""
+    return tuple(shlex.split(command))
+
 
 def sh(command: str, cwd: Optional[str] = None) -> None:
     """
     Executes a shell command.
 
+    The command is split with shell quoting rules and run directly, without a
+    shell. Its output is discarded; stderr is captured for the error message.
+
     Args:
         command: The shell command to execute
         cwd: Working directory for command execution. Defaults to the directory containing this file.
@@ -22,11 +42,18 @@ def sh(command: str, cwd: Optional[str] = None) -> None:
         RuntimeError: If command execution fails
     """
     try:
-        if cwd is None:
-            cwd = os.path.dirname(__file__) or None
-        subprocess.run(command.split(), check=True, cwd=cwd)
+        subprocess.run(
+            list(_tokenize(command)),
+            check=True,
+            cwd=_SRC_DIR if cwd is None else cwd,
+            close_fds=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+        )
     except subprocess.CalledProcessError as e:
-        raise RuntimeError(f"Command failed with exit code {e.returncode}: {e}") from e
+        stderr = (e.stderr or b"").decode(errors="replace").strip()
+        details = f": {stderr}" if stderr else ""
+        raise RuntimeError(f"Command failed with exit code {e.returncode}: {e}{details}") from e
     except Exception as e:
         raise RuntimeError(f"Error executing command '{command}': {e}") from e
 
@@ -58,10 +85,27 @@ def is_file_has_size(file_path: str, expected_file_size: int) -> bool:
     Returns:
         True if file exists and has expected size, False otherwise
     """
+    st = stat_file(file_path)
+    return st is not None and st.st_size == expected_file_size
+
+
+def stat_file(file_path: str) -> Optional[os.stat_result]:
+    """
+    Returns the stat result for a file, or None if it cannot be stat'ed.
+
+    Callers that need several attributes of the same file (size, mtime, ...)
+    can read them from one result instead of making a syscall for each.
+
+    Args:
+        file_path: Path to the file
+
+    Returns:
+        The os.stat_result, or None if the file doesn't exist or cannot be accessed
+    """
     try:
-        return os.path.getsize(file_path) == expected_file_size
-    except (FileNotFoundError, OSError):
-        return False
+        return os.stat(file_path)
+    except (OSError, ValueError):
+        return None
 
 
 def is_files_left_in_dir(dir_path: str) -> bool:
@@ -74,16 +118,36 @@ def is_files_left_in_dir(dir_path: str) -> bool:
     Returns:
         True if directory exists and contains files, False otherwise
     """
-    if not is_dir_exist(dir_path):
+    try:
+        # DirEntry.is_file() uses the file type reported by readdir, so no
+        # per-entry stat is needed; any() stops at the first file found.
+        with os.scandir(dir_path) as entries:
+            return any(entry.is_file() for entry in entries)
+    except (OSError, ValueError):
         return False
 
+
+def list_files_in_dir(dir_path: str) -> List[str]:
+    """
+    Returns the names of all files (not subdirectories) in a directory.
+
+    Args:
+        dir_path: Path to the directory to list
+
+    Returns:
+        Names of the files in the directory, in directory order.
+        A directory that doesn't exist is treated as empty.
+
+    Raises:
+        RuntimeError: If directory cannot be accessed
+    """
     try:
-        return any(
-            os.path.isfile(os.path.join(dir_path, item))
-            for item in os.listdir(dir_path)
-        )
-    except OSError:
-        return False
+        with os.scandir(dir_path) as entries:
+            return [entry.name for entry in entries if entry.is_file()]
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+    except OSError as e:
+        raise RuntimeError(f"Cannot access directory '{dir_path}': {e}") from e
 
 
 def get_random_file_from_dir(dir_path: str) -> str:
@@ -97,26 +161,87 @@ def get_random_file_from_dir(dir_path: str) -> str:
         Name of a randomly selected file
 
     Raises:
-        RuntimeError: If directory doesn't exist or contains no files
-        OSError: If directory cannot be accessed
+        RuntimeError: If directory doesn't exist, cannot be accessed or contains no files
     """
-    if not is_dir_exist(dir_path):
-        raise RuntimeError(f"Directory does not exist: {dir_path}")
-
+    # Reservoir sampling: the k-th file replaces the current choice with
+    # probability 1/k, which picks uniformly without building the listing.
+    choice = None
+    seen = 0
     try:
-        all_items = os.listdir(dir_path)
+        with os.scandir(dir_path) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    seen += 1
+                    if random.randrange(seen) == 0:
+                        choice = entry.name
+    except (FileNotFoundError, NotADirectoryError):
+        pass
     except OSError as e:
         raise RuntimeError(f"Cannot access directory '{dir_path}': {e}") from e
 
-    files: List[str] = [
-        item for item in all_items
-        if os.path.isfile(os.path.join(dir_path, item))
-    ]
+    if choice is None:
+        raise RuntimeError(f"No files found in directory: {dir_path}")
+
+    return choice
+
+
+def get_n_files_from_dir(dir_path: str, n: int) -> List[str]:
+    """
+    Returns up to `n` distinct files from a directory, chosen at random.
+
+    Args:
+        dir_path: Path to the directory to search
+        n: Maximum number of files to return
+
+    Returns:
+        Names of the randomly selected files (fewer than `n` if the directory has fewer files)
+
+    Raises:
+        RuntimeError: If directory doesn't exist, cannot be accessed or contains no files
+    """
+    files = list_files_in_dir(dir_path)
 
     if not files:
         raise RuntimeError(f"No files found in directory: {dir_path}")
 
-    return random.choice(files)
+    return random.sample(files, min(n, len(files)))
+
+
+def append_line(file_path: str, line: str) -> None:
+    """
+    Appends one line to a file.
+
+    The file is opened once per path with O_APPEND and the descriptor is kept
+    for later calls, so each line costs a single write. Writes of one line
+    from different threads or forked processes do not interleave.
+
+    Args:
+        file_path: Path to the file, created if missing
+        line: Text to append; a newline is added
+
+    Raises:
+        OSError: If the file cannot be opened or written
+    """
+    fd = _APPEND_FDS.get(file_path)
+    if fd is None:
+        with _APPEND_FDS_LOCK:
+            fd = _APPEND_FDS.get(file_path)
+            if fd is None:
+                fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND | os.O_CLOEXEC, 0o644)
+                _APPEND_FDS[file_path] = fd
+    os.write(fd, f"{line}\n".encode("utf-8"))
+
+
+@atexit.register
+def close_append_files() -> None:
+    """Closes the descriptors opened by append_line."""
+    with _APPEND_FDS_LOCK:
+        for fd in _APPEND_FDS.values():
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        _APPEND_FDS.clear()
 
 
 def validate_directory(dir_path: str) -> Path:
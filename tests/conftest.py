@@ -2,107 +2,203 @@
 Test configuration and fixtures for pytest.
 """
 
+import logging
 import os
+import shutil
 import tempfile
 import pytest
 from pathlib import Path
 from unittest.mock import patch
 
-from src.config import Config, TypeOfTranslation, Provider, DEFAULT_GEMINI_MODEL
+from src import log_single_file, utils
+from src.config import Config, TypeOfTranslation, DEFAULT_OPENROUTER_MODEL
+
+# Keep test files on tmpfs when it is available, unless TMPDIR was set explicitly.
+if "TMPDIR" not in os.environ and os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK):
+    os.environ["TMPDIR"] = "/dev/shm"
+    tempfile.tempdir = None  # re-read TMPDIR on next use
+
+POOL_SUBDIRS = (
+    "input_pool",
+    "french_pool",
+    "output_pool",
+    "input_pool_completed",
+    "french_pool_completed",
+)
+
+# File contents are encoded once so fixtures can write them with a bare os.write.
+SAMPLE_TEXTS = tuple(
+    f"This is test content {i}. It has multiple sentences.\nSecond line here.".encode("utf-8")
+    for i in range(3)
+)
+POOL_SAMPLES = tuple(
+    f"Sample English text {i} for translation testing.".encode("utf-8")
+    for i in range(2)
+)
+
+
+def _write_file(path, data):
+    """Write bytes to path without building a buffered text file object."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
 
 
 @pytest.fixture
-def temp_dir():
+def temp_dir(tmp_path):
     """Create a temporary directory for testing."""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        yield temp_dir
+    # pytest prunes old tmp_path trees in bulk at session start, so no test
+    # pays for an rmtree of its own directory.
+    return str(tmp_path)
+
+
+@pytest.fixture(scope="session")
+def pooling_root(tmp_path_factory):
+    """Create the pool directory skeleton once per test session."""
+    pooling_dir = str(tmp_path_factory.mktemp("pooling"))
+    for subdir in POOL_SUBDIRS:
+        os.mkdir(os.path.join(pooling_dir, subdir))
+    return pooling_dir
+
+
+def _empty_pools(pooling_dir):
+    """Remove everything inside the pool directories, recreating any that are missing."""
+    for subdir in POOL_SUBDIRS:
+        path = os.path.join(pooling_dir, subdir)
+        try:
+            entries = os.scandir(path)
+        except FileNotFoundError:
+            # The parent always exists, so a plain mkdir is enough.
+            os.mkdir(path)
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    shutil.rmtree(entry.path)
+                else:
+                    os.unlink(entry.path)
 
 
 @pytest.fixture
-def mock_config(temp_dir):
-    """Create a mock Config object for testing."""
+def make_config(temp_dir):
+    """
+    Return a factory for Configs rooted in temp_dir.
+
+    API key loading and model resolution are patched once for the whole test
+    rather than around every construction, and each Config gets a fixed test
+    API key. Keyword arguments override the defaults passed to Config.
+    """
+    defaults = {
+        "cycles": 1,
+        "initial_translation_type_str": "en_to_fr",
+        "pooling_dir": "./data",
+        "log_dir": "logs",
+        "local_base_dir": temp_dir,
+    }
+
+    def _make(**overrides):
+        config = Config(**{**defaults, **overrides})
+        config.api_key = "test-key"  # Normally set by the patched _load_api_key
+        return config
+
     with patch('src.config.Config._load_api_key'), \
-         patch('src.config.Config._resolve_model_name', return_value=DEFAULT_GEMINI_MODEL):
-        config = Config(
-            cycles=1,
-            initial_translation_type_str="en_to_fr",
-            pooling_dir=os.path.join(temp_dir, "pooling"),
-            log_dir="logs",
-            local_base_dir=temp_dir
-        )
-        yield config
+         patch('src.config.Config._resolve_model_name', return_value=DEFAULT_OPENROUTER_MODEL):
+        yield _make
+
+
+@pytest.fixture
+def mock_config(make_config, pooling_root):
+    """Create a mock Config object for testing, using the shared pool directories."""
+    return make_config(pooling_dir=pooling_root)
 
 
 @pytest.fixture
 def sample_text_files(temp_dir):
     """Create sample text files for testing."""
     files = []
-    for i in range(3):
+    for i, data in enumerate(SAMPLE_TEXTS):
         file_path = os.path.join(temp_dir, f"test_{i}.txt")
-        with open(file_path, "w", encoding="utf-8") as f:
-            f.write(f"This is test content {i}. It has multiple sentences.\nSecond line here.")
+        _write_file(file_path, data)
         files.append(file_path)
     return files
 
 
 @pytest.fixture
-def pooling_structure(temp_dir):
-    """Create the directory structure for pooling tests."""
-    pooling_dir = os.path.join(temp_dir, "pooling")
-    subdirs = [
-        "input_pool",
-        "french_pool",
-        "output_pool",
-        "input_pool_completed",
-        "french_pool_completed"
-    ]
-
-    for subdir in subdirs:
-        os.makedirs(os.path.join(pooling_dir, subdir), exist_ok=True)
+def pool_samples():
+    """The texts of the pooling_structure input files, indexed like sample_<i>.txt."""
+    return tuple(data.decode("utf-8") for data in POOL_SAMPLES)
 
-    # Add some sample files
-    input_pool = os.path.join(pooling_dir, "input_pool")
-    for i in range(2):
-        file_path = os.path.join(input_pool, f"sample_{i}.txt")
-        with open(file_path, "w", encoding="utf-8") as f:
-            f.write(f"Sample English text {i} for translation testing.")
 
-    return pooling_dir
+@pytest.fixture
+def pooling_structure(pooling_root):
+    """Fill the shared pool directories for a test and empty them afterwards."""
+    _empty_pools(pooling_root)
 
+    # Add some sample files
+    input_pool = os.path.join(pooling_root, "input_pool")
+    for i, data in enumerate(POOL_SAMPLES):
+        _write_file(os.path.join(input_pool, f"sample_{i}.txt"), data)
 
-@pytest.fixture(autouse=True)
-def reset_logging():
-    """Reset logging configuration before each test."""
-    import logging
-    import gc
-    from src import log_single_file
+    yield pooling_root
+
+    _empty_pools(pooling_root)
 
-    # Reset the global flag
-    log_single_file._logger_configured = False
 
-    # Clear existing handlers and force garbage collection
+@pytest.fixture(scope="session", autouse=True)
+def silence_logs():
+    """Drop log records at the root logger unless a test configures logging itself."""
     root_logger = logging.getLogger()
-    for handler in root_logger.handlers[:]:
-        root_logger.removeHandler(handler)
-        handler.close()
+    saved_level = root_logger.level
+    null_handler = logging.NullHandler()
+    # Records below this level are rejected by isEnabledFor before any formatting.
+    root_logger.setLevel(logging.CRITICAL + 1)
+    root_logger.addHandler(null_handler)
+
+    yield
+
+    root_logger.removeHandler(null_handler)
+    root_logger.setLevel(saved_level)
 
-    # Force garbage collection to release file handles
-    gc.collect()
 
-    # Reset cycle counter
-    log_single_file._current_cycle_count = 0
+@pytest.fixture(autouse=True)
+def reset_logging():
+    """Reset logging configuration around each test, restoring the root logger's handlers afterwards."""
+    # Stop any background log listener and forget the configured log file
+    log_single_file.stop_logging()
+    log_single_file._reset_cycle_counter()
+
+    root_logger = logging.getLogger()
+    saved_handlers = root_logger.handlers[:]
+    saved_level = root_logger.level
 
     yield
 
     # Cleanup after test
-    log_single_file._logger_configured = False
-    log_single_file._current_cycle_count = 0
+    log_single_file.stop_logging()
+    log_single_file._reset_cycle_counter()
 
-    # Clear handlers again after test
-    for handler in root_logger.handlers[:]:
-        root_logger.removeHandler(handler)
-        handler.close()
-    gc.collect()
+    # Close only the handlers this test added, so file handles are released
+    # immediately instead of waiting for garbage collection.
+    for handler in root_logger.handlers:
+        if handler not in saved_handlers:
+            handler.close()
+    root_logger.handlers[:] = saved_handlers
+    root_logger.setLevel(saved_level)
+
+
+@pytest.fixture(autouse=True)
+def reset_translate_state():
+    """Drop cached OpenRouter HTTP sessions, pool indexes, created directories and append fds after each test."""
+    yield
+
+    # Imported here so collecting the tests does not load the translation pipeline.
+    from src import translate_single_file
+    translate_single_file._get_session.cache_clear()
+    translate_single_file._POOL.clear()
+    translate_single_file._ensure_dir.cache_clear()
+    utils.close_append_files()
 
 
 @pytest.fixture
@@ -150,12 +246,3 @@ def mock_home_directory(mock_model_files, temp_dir):
     """Mock the home directory for testing dotfiles."""
     with patch('src.config.Path.home', return_value=Path(temp_dir)):
         yield temp_dir
-
-
-@pytest.fixture
-def mock_logging():
-    """Mock logging functionality to avoid file handle issues."""
-    with patch('src.log_single_file.setup_logging'), \
-         patch('src.update_custom_log.update_custom_log'), \
-         patch('src.log_single_file.logger'):
-        yield
\ No newline at end of file
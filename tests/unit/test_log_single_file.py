@@ -3,282 +3,194 @@ Unit tests for the log_single_file module.
 """
 
 import os
-import tempfile
 import logging
-from unittest.mock import patch, mock_open
+import logging.handlers
+import mmap
+from contextlib import ExitStack
+from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
-from src.log_single_file import setup_logging, log_single_cycle
-from src.config import Config, TypeOfTranslation, Provider, DEFAULT_GEMINI_MODEL
+from src import log_single_file
+from src.log_single_file import setup_logging, log_single_cycle, fast_log_cycle
+
+
+@pytest.fixture
+def cycle_config(make_config):
+    """A Config whose log file lives under the test's temporary directory."""
+    return make_config()
 
 
 class TestSetupLogging:
     """Test the setup_logging function."""
 
-    def test_setup_logging_first_time(self):
+    def test_setup_logging_first_time(self, temp_dir):
         """Test setting up logging for the first time."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            log_file = os.path.join(temp_dir, "test.log")
+        log_file = os.path.join(temp_dir, "test.log")
 
-            setup_logging(log_file)
+        setup_logging(log_file)
 
-            # Check that log file was created
-            assert os.path.exists(log_file)
+        # Check that log file was created
+        assert os.path.exists(log_file)
 
-            # Check that root logger has handlers
-            root_logger = logging.getLogger()
-            assert len(root_logger.handlers) >= 2  # File and console handlers
+        # Check that the root logger only queues records
+        root_logger = logging.getLogger()
+        assert [type(h) for h in root_logger.handlers] == [logging.handlers.QueueHandler]
 
-            # Check that file handler has correct path
-            file_handlers = [h for h in root_logger.handlers if isinstance(h, logging.FileHandler)]
-            assert len(file_handlers) == 1
-            assert file_handlers[0].baseFilename == log_file
+        # Check that the listener writes to the file and console
+        assert len(log_single_file._listener.handlers) == 2  # File and console handlers
 
-    def test_setup_logging_multiple_calls(self):
-        """Test that multiple calls to setup_logging don't create duplicate handlers."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            log_file = os.path.join(temp_dir, "test.log")
+        # Check that the registered file handler has the correct path
+        assert list(log_single_file._file_handlers) == [log_file]
+        assert log_single_file._file_handlers[log_file].baseFilename == log_file
 
-            # First call
-            setup_logging(log_file)
-            root_logger = logging.getLogger()
-            initial_handler_count = len(root_logger.handlers)
+    def test_setup_logging_multiple_calls(self, temp_dir):
+        """Test that multiple calls to setup_logging don't create duplicate handlers."""
+        log_file = os.path.join(temp_dir, "test.log")
+
+        # First call
+        setup_logging(log_file)
+        root_logger = logging.getLogger()
+        initial_handlers = root_logger.handlers[:]
+        file_handler = log_single_file._file_handlers[log_file]
+
+        # Second call, through a relative path to the same file
+        setup_logging(os.path.relpath(log_file))
+
+        # Should still have the same handlers
+        assert root_logger.handlers == initial_handlers
+        assert log_single_file._file_handlers == {log_file: file_handler}
+
+    def test_setup_logging_new_path_reconfigures(self, temp_dir):
+        """Test that a different log file replaces the configured one."""
+        first_log = os.path.join(temp_dir, "first.log")
+        second_log = os.path.join(temp_dir, "second.log")
+
+        setup_logging(first_log)
+        first_handler = log_single_file._file_handlers[first_log]
+        setup_logging(second_log)
+
+        assert list(log_single_file._file_handlers) == [second_log]
+        assert first_handler.stream is None  # Closed by the reconfiguration
+        logging.getLogger("test").info("after switch")
+        log_single_file.stop_logging()
+        assert "after switch" in Path(second_log).read_text(encoding="utf-8")
+        assert "after switch" not in Path(first_log).read_text(encoding="utf-8")
+
+    def test_records_reach_file_after_stop(self, temp_dir):
+        """Test that queued records are written out when logging is stopped."""
+        log_file = os.path.join(temp_dir, "test.log")
+
+        setup_logging(log_file)
+        logging.getLogger("test").info("queued message")
+        log_single_file.stop_logging()
+
+        assert "queued message" in Path(log_file).read_text(encoding="utf-8")
+        assert log_single_file._listener is None
+        assert log_single_file._file_handlers == {}
+
+    def test_file_handler_flushes_only_errors(self, temp_dir):
+        """Test that the file handler buffers records until an ERROR arrives."""
+        log_file = os.path.join(temp_dir, "test.log")
+        handler = log_single_file._BufferedFileHandler(log_file, encoding="utf-8")
+
+        def record(level, msg):
+            return logging.LogRecord("test", level, __file__, 0, msg, None, None)
+
+        try:
+            handler.emit(record(logging.INFO, "buffered message"))
+            assert Path(log_file).read_text(encoding="utf-8") == ""
+
+            handler.emit(record(logging.ERROR, "urgent message"))
+            assert Path(log_file).read_text(encoding="utf-8") == "buffered message\nurgent message\n"
+        finally:
+            handler.close()
+
+    def test_setup_logging_directory_creation(self, temp_dir):
+        """Test that setup_logging creates the log directory if it doesn't exist."""
+        log_dir = os.path.join(temp_dir, "nested", "logs")
+        log_file = os.path.join(log_dir, "test.log")
 
-            # Second call
-            setup_logging(log_file)
+        # Directory shouldn't exist yet
+        assert not os.path.exists(log_dir)
 
-            # Should still have the same number of handlers
-            assert len(root_logger.handlers) == initial_handler_count
+        setup_logging(log_file)
 
-    def test_setup_logging_directory_creation(self):
-        """Test that setup_logging creates the log directory if it doesn't exist."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            log_dir = os.path.join(temp_dir, "nested", "logs")
-            log_file = os.path.join(log_dir, "test.log")
+        # Directory should be created
+        assert os.path.exists(log_dir)
+        assert os.path.exists(log_file)
 
-            # Directory shouldn't exist yet
-            assert not os.path.exists(log_dir)
+    @pytest.mark.parametrize("target", [
+        'src.log_single_file.os.makedirs',
+        'src.log_single_file._BufferedFileHandler',
+    ], ids=["makedirs", "file_handler"])
+    def test_setup_logging_falls_back_on_error(self, target, temp_dir):
+        """Test that directory or file handler creation errors fall back to basic console logging."""
+        log_file = os.path.join(temp_dir, "test.log")
 
+        with ExitStack() as stack:
+            stack.enter_context(patch(target, side_effect=OSError("Permission denied")))
+            mock_basic_config = stack.enter_context(patch('src.log_single_file.logging.basicConfig'))
             setup_logging(log_file)
+            setup_logging(log_file)  # Not retried for the same file
 
-            # Directory should be created
-            assert os.path.exists(log_dir)
-            assert os.path.exists(log_file)
+        mock_basic_config.assert_called_once()
+        assert log_single_file._file_handlers == {log_file: None}
 
-    @patch('src.log_single_file.os.makedirs')
-    def test_setup_logging_handles_makedirs_error(self, mock_makedirs):
-        """Test handling of directory creation errors."""
-        mock_makedirs.side_effect = OSError("Permission denied")
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            log_file = os.path.join(temp_dir, "test.log")
+class TestLogSingleCycle:
+    """Test the log_single_cycle function."""
 
-            # Should fall back to basic console logging
-            with patch('src.log_single_file.logging.basicConfig') as mock_basic_config:
-                setup_logging(log_file)
-                mock_basic_config.assert_called_once()
+    @pytest.mark.parametrize("start,calls", [(1, 1), (6, 1), (4, 1), (1, 3)])
+    def test_cycle_counter(self, cycle_config, start, calls):
+        """Test that each call numbers the next cycle and logs it as the metric."""
+        log_single_file._reset_cycle_counter(start)
 
-    @patch('src.log_single_file.logging.FileHandler')
-    def test_setup_logging_handles_file_handler_error(self, mock_file_handler):
-        """Test handling of file handler creation errors."""
-        mock_file_handler.side_effect = OSError("Cannot create file handler")
+        with patch('src.update_custom_log.update_custom_log') as mock_update_log:
+            for _ in range(calls):
+                log_single_cycle(cycle_config)
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            log_file = os.path.join(temp_dir, "test.log")
+        last = start + calls - 1
+        assert [c.kwargs["x"] for c in mock_update_log.call_args_list] == list(range(start, last + 1))
+        mock_update_log.assert_called_with(x=last, y=last, name="cycle_completed")
+        assert next(log_single_file._cycle_counter) - 1 == last
 
-            # Should fall back to basic console logging
-            with patch('src.log_single_file.logging.basicConfig') as mock_basic_config:
-                setup_logging(log_file)
-                mock_basic_config.assert_called_once()
+    def test_log_single_cycle_calls_setup_logging(self, cycle_config):
+        """Test that log_single_cycle calls setup_logging with the config's log file."""
+        with patch('src.log_single_file.setup_logging') as mock_setup_logging:
+            log_single_cycle(cycle_config)
 
+        mock_setup_logging.assert_called_once_with(cycle_config.log_filepath)
 
-class TestLogSingleCycle:
-    """Test the log_single_cycle function."""
+    def test_log_single_cycle_uses_config_logfile(self, make_config):
+        """Test that log_single_cycle writes to the log file path from config."""
+        config = make_config(log_dir="custom_logs")
+
+        log_single_cycle(config)
+        log_single_file.stop_logging()  # Drain the queue to the file
 
-    def test_log_single_cycle_basic(self, mock_logging):
-        """Test basic cycle logging functionality."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            with patch('src.config.Config._load_api_key'), \
-                 patch('src.config.Config._resolve_model_name', return_value=DEFAULT_GEMINI_MODEL):
-                config = Config(
-                    cycles=1,
-                    initial_translation_type_str="en_to_fr",
-                    pooling_dir="./data",
-                    log_dir="logs",
-                    local_base_dir=temp_dir
-                )
-
-                # Reset the cycle counter
-                from src.log_single_file import _current_cycle_count
-                original_count = _current_cycle_count
-                _current_cycle_count = 0
-
-                try:
-                    log_single_cycle(config)
-                    # The actual logging is mocked, so we just verify the function runs
-                    assert _current_cycle_count == 1
-                finally:
-                    _current_cycle_count = original_count
-
-    def test_log_single_cycle_increment_counter(self, mock_logging):
-        """Test that cycle counter is incremented properly."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            with patch('src.config.Config._load_api_key'), \
-                 patch('src.config.Config._resolve_model_name', return_value=DEFAULT_GEMINI_MODEL):
-                config = Config(
-                    cycles=1,
-                    initial_translation_type_str="en_to_fr",
-                    pooling_dir="./data",
-                    log_dir="logs",
-                    local_base_dir=temp_dir
-                )
-
-                from src.log_single_file import _current_cycle_count
-
-                # Reset counter
-                original_count = _current_cycle_count
-                _current_cycle_count = 5
-
-                try:
-                    log_single_cycle(config)
-
-                    # Counter should be incremented
-                    assert _current_cycle_count == 6
-                finally:
-                    _current_cycle_count = original_count
-
-    def test_log_single_cycle_calls_setup_logging(self):
-        """Test that log_single_cycle calls setup_logging."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            with patch('src.config.Config._load_api_key'), \
-                 patch('src.config.Config._resolve_model_name', return_value=DEFAULT_GEMINI_MODEL), \
-                 patch('src.log_single_file.setup_logging') as mock_setup_logging:
-                config = Config(
-                    cycles=1,
-                    initial_translation_type_str="en_to_fr",
-                    pooling_dir="./data",
-                    log_dir="logs",
-                    local_base_dir=temp_dir
-                )
-
-                log_single_cycle(config)
-
-                mock_setup_logging.assert_called_once_with(config.log_filepath)
-
-    def test_log_single_cycle_uses_config_logfile(self):
-        """Test that log_single_cycle uses the log file path from config."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            log_file = os.path.join(temp_dir, "custom.log")
-
-            with patch('src.config.Config._load_api_key'), \
-                 patch('src.config.Config._resolve_model_name', return_value=DEFAULT_GEMINI_MODEL), \
-                 patch('src.config.Config.log_filepath', new_callable=lambda: property(lambda self: log_file)), \
-                 patch('builtins.open', mock_open()):
-                config = Config(
-                    cycles=1,
-                    initial_translation_type_str="en_to_fr",
-                    pooling_dir="./data",
-                    log_dir="logs",
-                    local_base_dir=temp_dir
-                )
-
-                log_single_cycle(config)
-
-                # The log file should be the one from config
-                assert config.log_filepath == log_file
-
-    def test_log_single_cycle_logs_metric(self, mock_logging):
-        """Test that log_single_cycle logs the cycle completion metric."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            with patch('src.config.Config._load_api_key'), \
-                 patch('src.config.Config._resolve_model_name', return_value=DEFAULT_GEMINI_MODEL):
-                config = Config(
-                    cycles=1,
-                    initial_translation_type_str="en_to_fr",
-                    pooling_dir="./data",
-                    log_dir="logs",
-                    local_base_dir=temp_dir
-                )
-
-                from src.log_single_file import _current_cycle_count
-                original_count = _current_cycle_count
-                _current_cycle_count = 3
-
-                try:
-                    with patch('src.update_custom_log.update_custom_log') as mock_update_log:
-                        log_single_cycle(config)
-
-                        mock_update_log.assert_called_once_with(
-                            x=4,  # Counter gets incremented before logging
-                            y=4,
-                            name="cycle_completed"
-                        )
-                finally:
-                    _current_cycle_count = original_count
+        lines = Path(config.log_filepath).read_text(encoding="utf-8").splitlines()
+        assert lines[-1].endswith("--- Cycle 1 completed. ---")
 
 
 class TestLogSingleCycleIntegration:
     """Integration tests for log_single_cycle."""
 
-    def test_multiple_cycles_increment_properly(self, mock_logging):
-        """Test that multiple calls increment the cycle counter properly."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            with patch('src.config.Config._load_api_key'), \
-                 patch('src.config.Config._resolve_model_name', return_value=DEFAULT_GEMINI_MODEL):
-                config = Config(
-                    cycles=1,
-                    initial_translation_type_str="en_to_fr",
-                    pooling_dir="./data",
-                    log_dir="logs",
-                    local_base_dir=temp_dir
-                )
-
-                from src.log_single_file import _current_cycle_count
-
-                # Reset counter
-                original_count = _current_cycle_count
-                _current_cycle_count = 0
-
-                try:
-                    # Log multiple cycles
-                    log_single_cycle(config)
-                    assert _current_cycle_count == 1
-
-                    log_single_cycle(config)
-                    assert _current_cycle_count == 2
-
-                    log_single_cycle(config)
-                    assert _current_cycle_count == 3
-                finally:
-                    _current_cycle_count = original_count
-
-    def test_log_file_contains_expected_content(self):
+    @pytest.mark.parametrize("fast", [False, True], ids=["logging", "fast_log_cycle"])
+    def test_log_file_contains_expected_content(self, cycle_config, fast):
         """Test that log file contains expected content after multiple cycles."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            log_file = os.path.join(temp_dir, "test.log")
-
-            with patch('src.config.Config._load_api_key'), \
-                 patch('src.config.Config._resolve_model_name', return_value=DEFAULT_GEMINI_MODEL):
-                config = Config(
-                    cycles=1,
-                    initial_translation_type_str="en_to_fr",
-                    pooling_dir="./data",
-                    log_dir="logs",
-                    local_base_dir=temp_dir
-                )
-
-                from src.log_single_file import _current_cycle_count
-                original_count = _current_cycle_count
-                _current_cycle_count = 0
-
-                try:
-                    log_single_cycle(config)
-                    log_single_cycle(config)
-
-                    with open(log_file, "r", encoding="utf-8") as f:
-                        content = f.read()
-                        assert "--- Cycle 1 completed. ---" in content
-                        assert "--- Cycle 2 completed. ---" in content
-                finally:
-                    _current_cycle_count = original_count
\ No newline at end of file
+        if fast:
+            log_filepath = cycle_config.log_filepath
+            fast_log_cycle(log_filepath, 1)
+            fast_log_cycle(log_filepath, 2)
+        else:
+            log_single_cycle(cycle_config)
+            log_single_cycle(cycle_config)
+            log_single_file.stop_logging()  # Drain the queue to the file
+
+        # Search the raw bytes in place rather than decoding the whole log.
+        with open(cycle_config.log_filepath, "rb") as f, \
+             mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            assert mm.find(b"--- Cycle 1 completed. ---") != -1
+            assert mm.find(b"--- Cycle 2 completed. ---") != -1
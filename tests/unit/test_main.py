@@ -0,0 +1,69 @@
+"""
+Unit tests for the main CLI module.
+"""
+
+import pytest
+from unittest.mock import patch
+
+
+DEFAULT_KWARGS = {
+    "cycles": 1,
+    "initial_translation_type_str": "en_to_fr",
+    "pooling_dir": "./data/pooling",
+    "log_dir": "./logs",
+    "model_name": None,
+    "batch_size": 1,
+    "max_workers": 1,
+    "use_async": False,
+    "processes": 1,
+    "cache_dir": None,
+}
+
+
+@pytest.mark.parametrize("argv,expected_kwargs", [
+    (
+        [
+            "main.py",
+            "--cycles", "3",
+            "--translation-type", "fr_to_en",
+            "--pooling-dir", "./test_pool",
+            "--log-dir", "./test_logs",
+            "--model", "custom-model",
+            "--batch-size", "4",
+            "--max-workers", "8",
+            "--use-async",
+            "--processes", "2",
+            "--cache-dir", "./cache",
+        ],
+        {
+            "cycles": 3,
+            "initial_translation_type_str": "fr_to_en",
+            "pooling_dir": "./test_pool",
+            "log_dir": "./test_logs",
+            "model_name": "custom-model",
+            "batch_size": 4,
+            "max_workers": 8,
+            "use_async": True,
+            "processes": 2,
+            "cache_dir": "./cache",
+        },
+    ),
+    (["main.py"], DEFAULT_KWARGS),
+], ids=["all_args", "defaults"])
+@patch('src.main.setup_logging')
+@patch('src.main.main')
+@patch('src.main.Config')
+def test_main_cli(mock_config_cls, mock_main, mock_setup_logging, argv, expected_kwargs, monkeypatch, tmp_path):
+    """Test that CLI arguments are passed through to Config and the config to main."""
+    # The CLI paths are relative; keep anything they touch out of the repo root.
+    monkeypatch.chdir(tmp_path)
+    # Imported here so collecting this module does not load the translation pipeline.
+    from src.main import main_cli
+
+    with patch('sys.argv', argv):
+        main_cli()
+
+    mock_config_cls.assert_called_once_with(**expected_kwargs)
+    config = mock_config_cls.return_value
+    mock_setup_logging.assert_called_once_with(config.log_filepath)
+    mock_main.assert_called_once_with(config=config)
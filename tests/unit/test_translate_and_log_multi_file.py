@@ -0,0 +1,66 @@
+"""
+Unit tests for the translate_and_log_multi_file module.
+"""
+
+import logging
+from unittest.mock import patch
+
+import pytest
+
+from src.config import TypeOfTranslation
+from src.translate_and_log_multi_file import translate_and_log_multi_file
+
+MODULE = 'src.translate_and_log_multi_file'
+
+
+@pytest.fixture
+def cycle_log(caplog):
+    """Capture this module's records despite the session-wide silenced root logger."""
+    caplog.set_level(logging.INFO, logger=MODULE)
+    return caplog
+
+
+def _errors(caplog):
+    return [r for r in caplog.records if r.levelno == logging.ERROR]
+
+
+class TestTranslateAndLogMultiFile:
+    """Test the cycle loop's error handling."""
+
+    def test_repeated_runtime_error_is_reported_once_per_window(self, make_config, cycle_log):
+        """Test that an identical RuntimeError is logged once per 100-cycle block and the rest are counted."""
+        config = make_config(cycles=150)
+        with patch(f'{MODULE}.translate_and_log_single_cycle',
+                   side_effect=RuntimeError("No files found")) as mock_cycle:
+            translate_and_log_multi_file(config)
+
+        assert mock_cycle.call_count == 150  # Every cycle is attempted
+        # Cycles 1-99 fall in block 0 and cycles 100-150 in block 1.
+        assert [r.args[0] for r in _errors(cycle_log)] == [1, 100]
+        assert "Suppressed 148 repeated cycle error message(s)." in cycle_log.messages
+
+    def test_direction_alternates_after_skipped_cycle(self, make_config):
+        """Test that a cycle skipped for a RuntimeError still flips the translation direction."""
+        config = make_config(cycles=3)
+        with patch(f'{MODULE}.translate_and_log_single_cycle',
+                   side_effect=[RuntimeError("No files found"), None, None]) as mock_cycle:
+            translate_and_log_multi_file(config)
+
+        assert [c.kwargs["current_translation_type"] for c in mock_cycle.call_args_list] == [
+            TypeOfTranslation.en_to_fr,
+            TypeOfTranslation.fr_to_en,
+            TypeOfTranslation.en_to_fr,
+        ]
+
+    def test_other_error_stops_the_loop(self, make_config, cycle_log):
+        """Test that a non-RuntimeError ends the run and is logged with its traceback."""
+        config = make_config(cycles=5)
+        with patch(f'{MODULE}.translate_and_log_single_cycle',
+                   side_effect=[None, OSError("Failed to move file")]) as mock_cycle:
+            translate_and_log_multi_file(config)
+
+        assert mock_cycle.call_count == 2
+        [error] = _errors(cycle_log)
+        assert "stopping further cycles" in error.getMessage()
+        assert error.exc_info[0] is OSError
+        assert not any("Suppressed" in m for m in cycle_log.messages)
@@ -0,0 +1,429 @@
+"""
+Unit tests for the translate_single_file module.
+"""
+
+import errno
+import os
+import re
+import multiprocessing.dummy
+import shutil
+import sys
+from contextlib import ExitStack
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src import log_single_file, translation_cache
+from src.config import TypeOfTranslation
+from src.utils import list_files_in_dir
+from src.translate_single_file import (
+    translate_single_file,
+    translate_batch,
+    translate_files_concurrent,
+    translate_files_async,
+    translate_n_files_parallel,
+    _build_batch_text,
+    _split_batch_response,
+    _get_session,
+    _request_completion,
+    _SYSTEM_PROMPTS,
+    _move_input_to_completed,
+)
+
+# The canned translation returned by the patched API calls.
+TRANSLATION = "Bonjour"
+
+
+def _echo_batch(config, system_prompt, text, request_label):
+    """Fake API call that 'translates' each batch document by upper-casing it."""
+    docs = re.split(r"^(===DOC \d+===)$", text, flags=re.MULTILINE)[1:]
+    return "\n".join(f"{marker}\n{text.strip().upper()}" for marker, text in zip(docs[::2], docs[1::2]))
+
+
+class TestSplitBatchResponse:
+    """Test parsing of batch prompts and responses."""
+
+    def test_round_trip(self):
+        """Test that every document in a batch text can be split back out."""
+        text = _build_batch_text(["Hello", "Good\nmorning"])
+        assert text.startswith("===DOC 0===\nHello\n")
+
+        segments = _split_batch_response(_echo_batch(None, "", text, "test"))
+        assert segments == {0: "HELLO", 1: "GOOD\nMORNING"}
+
+    def test_missing_marker_is_omitted(self):
+        """Test that a document missing from the response is not returned."""
+        segments = _split_batch_response(f"===DOC 1===\n{TRANSLATION}\n")
+        assert segments == {1: TRANSLATION}
+
+
+class TestRequestCompletion:
+    """Test the OpenRouter request helper."""
+
+    def test_session_is_reused_per_api_key(self):
+        """Test that the HTTP session is created once per API key."""
+        session = _get_session("key-a")
+        assert _get_session("key-a") is session
+        assert _get_session("key-b") is not session
+        assert session.headers["Authorization"] == "Bearer key-a"
+
+    def test_returns_first_choice_content(self, mock_config):
+        """Test that the first choice's content is returned stripped."""
+        with patch('src.translate_single_file.wait_for_rate_limit', return_value=False), \
+             patch('requests.Session.post') as mock_post:
+            mock_post.return_value.status_code = 200
+            mock_post.return_value.json.return_value = {"choices": [{"message": {"content": f" {TRANSLATION} \n"}}]}
+
+            assert _request_completion(mock_config, "system", "text", "test") == TRANSLATION
+            assert _request_completion(mock_config, "system", "text", "test") == TRANSLATION
+
+        assert mock_post.call_count == 2
+        messages = mock_post.call_args.kwargs["json"]["messages"]
+        assert messages == [{"role": "system", "content": "system"}, {"role": "user", "content": "text"}]
+
+    @pytest.mark.parametrize("body", [
+        {},
+        {"choices": []},
+        {"choices": None},
+        {"choices": [{"message": {}}]},
+        {"choices": [{"message": {"content": None}}]},
+    ])
+    def test_missing_content_returns_empty(self, mock_config, body):
+        """Test that responses without first-choice content yield an empty string."""
+        with patch('src.translate_single_file.wait_for_rate_limit', return_value=False), \
+             patch('requests.Session.post') as mock_post:
+            mock_post.return_value.status_code = 200
+            mock_post.return_value.json.return_value = body
+
+            assert _request_completion(mock_config, "system", "text", "test") == ""
+
+    def test_error_status_raises(self, mock_config):
+        """Test that a non-200 response raises RuntimeError."""
+        with patch('src.translate_single_file.wait_for_rate_limit', return_value=False), \
+             patch('requests.Session.post') as mock_post:
+            mock_post.return_value.status_code = 429
+            mock_post.return_value.text = "rate limited"
+
+            with pytest.raises(RuntimeError, match="OpenRouter API error 429: rate limited"):
+                _request_completion(mock_config, "system", "text", "test")
+
+
+class TestTranslateSingleFile:
+    """Test the single-file translation path."""
+
+    def test_translates_and_moves_file(self, mock_config, pooling_structure):
+        """Test that the output is written and the input moved to completed."""
+        with patch('src.translate_single_file._request_completion', return_value=TRANSLATION) as mock_request:
+            translate_single_file(mock_config, TypeOfTranslation.en_to_fr)
+
+        mock_request.assert_called_once()
+        assert mock_request.call_args.args[1] == _SYSTEM_PROMPTS[TypeOfTranslation.en_to_fr]
+        input_pool = os.path.join(pooling_structure, "input_pool")
+        output_files = os.listdir(os.path.join(pooling_structure, "french_pool"))
+        assert len(output_files) == 1
+        assert len(os.listdir(input_pool)) == 1
+        assert output_files == os.listdir(os.path.join(pooling_structure, "input_pool_completed"))
+        assert Path(pooling_structure, "french_pool", output_files[0]).read_text(encoding="utf-8") == TRANSLATION
+
+    def test_pool_is_scanned_once(self, mock_config, pooling_structure):
+        """Test that consecutive calls are served from one directory scan."""
+        with patch('src.translate_single_file._request_completion', return_value=TRANSLATION), \
+             patch('src.translate_single_file.utils.list_files_in_dir', wraps=list_files_in_dir) as mock_list:
+            translate_single_file(mock_config, TypeOfTranslation.en_to_fr)
+            translate_single_file(mock_config, TypeOfTranslation.en_to_fr)
+
+        mock_list.assert_called_once()
+        assert os.listdir(os.path.join(pooling_structure, "input_pool")) == []
+
+    def test_vanished_file_is_skipped(self, mock_config, pooling_structure):
+        """Test that a file removed after the scan is skipped, not translated."""
+        with patch('src.translate_single_file._request_completion', return_value=TRANSLATION):
+            translate_single_file(mock_config, TypeOfTranslation.en_to_fr)
+            (remaining,) = os.listdir(os.path.join(pooling_structure, "input_pool"))
+            os.unlink(os.path.join(pooling_structure, "input_pool", remaining))
+
+            with pytest.raises(RuntimeError, match="No files found"):
+                translate_single_file(mock_config, TypeOfTranslation.en_to_fr)
+
+    def test_api_error_is_written_to_error_log(self, mock_config, pooling_structure):
+        """Test that an API failure is recorded in the error log and the input stays in the pool."""
+        with patch('src.translate_single_file._request_completion', side_effect=RuntimeError("boom\ndetails")):
+            translate_single_file(mock_config, TypeOfTranslation.en_to_fr)
+
+        assert os.listdir(os.path.join(pooling_structure, "french_pool")) == []
+        assert os.listdir(os.path.join(pooling_structure, "input_pool_completed")) == []
+        direction, failed, marker = Path(mock_config.error_log_filepath).read_text(encoding="utf-8").rstrip("\n").split("\t")
+        assert (direction, marker) == ("en_to_fr", "OPENROUTER_API_ERROR: boom details")
+        assert failed in os.listdir(os.path.join(pooling_structure, "input_pool"))
+
+    def test_cache_hit_skips_api_call(self, mock_config, pooling_structure, pool_samples, temp_dir):
+        """Test that a cached translation is reused without calling the API."""
+        mock_config.cache_dir = os.path.join(temp_dir, "cache")
+        for i in range(2):
+            key = translation_cache.make_key(
+                TypeOfTranslation.en_to_fr,
+                mock_config.resolved_model_name,
+                pool_samples[i],
+            )
+            translation_cache.put(mock_config.cache_dir, key, f"Texte {i}")
+
+        with patch('src.translate_single_file._request_completion') as mock_request:
+            translate_single_file(mock_config, TypeOfTranslation.en_to_fr)
+
+        mock_request.assert_not_called()
+        output_pool = os.path.join(pooling_structure, "french_pool")
+        (output_file,) = os.listdir(output_pool)
+        assert Path(output_pool, output_file).read_text(encoding="utf-8") == f"Texte {output_file[len('sample_')]}"
+
+    def test_successful_translation_is_cached(self, mock_config, pooling_structure, pool_samples, temp_dir):
+        """Test that a successful API translation is stored in the cache."""
+        mock_config.cache_dir = os.path.join(temp_dir, "cache")
+        with patch('src.translate_single_file._request_completion', return_value=TRANSLATION):
+            translate_single_file(mock_config, TypeOfTranslation.en_to_fr)
+
+        (done,) = os.listdir(os.path.join(pooling_structure, "input_pool_completed"))
+        key = translation_cache.make_key(
+            TypeOfTranslation.en_to_fr,
+            mock_config.resolved_model_name,
+            pool_samples[int(done[len('sample_')])],
+        )
+        assert translation_cache.get(mock_config.cache_dir, key) == TRANSLATION
+
+    def test_oversized_input_is_not_sent(self, mock_config, pooling_structure):
+        """Test that inputs above MAX_TRANSLATE_BYTES skip the API call."""
+        with patch('src.translate_single_file.MAX_TRANSLATE_BYTES', 10), \
+             patch('src.translate_single_file._request_completion') as mock_request:
+            translate_single_file(mock_config, TypeOfTranslation.en_to_fr)
+
+        mock_request.assert_not_called()
+        assert Path(mock_config.error_log_filepath).read_text(encoding="utf-8").endswith("\tFILE_TOO_LARGE: 46 bytes\n")
+
+
+class TestTranslateBatch:
+    """Test the batched translation path."""
+
+    def test_translates_whole_batch_with_one_request(self, mock_config, pooling_structure):
+        """Test that all files are translated with a single API request."""
+        with patch('src.translate_single_file._request_completion', side_effect=_echo_batch) as mock_request:
+            completed = translate_batch(mock_config, TypeOfTranslation.en_to_fr, batch_size=16)
+
+        assert completed == 2
+        mock_request.assert_called_once()
+        assert os.listdir(os.path.join(pooling_structure, "input_pool")) == []
+        output_pool = os.path.join(pooling_structure, "french_pool")
+        for i in range(2):
+            assert Path(output_pool, f"sample_{i}.txt").read_text(encoding="utf-8") == f"SAMPLE ENGLISH TEXT {i} FOR TRANSLATION TESTING."
+
+    def test_unparsed_segment_stays_in_pool(self, mock_config, pooling_structure):
+        """Test that files without a response segment are recorded in the error log and not moved."""
+        with patch('src.translate_single_file._request_completion', return_value=f"===DOC 0===\n{TRANSLATION}"):
+            completed = translate_batch(mock_config, TypeOfTranslation.en_to_fr, batch_size=16)
+
+        assert completed == 1
+        (remaining,) = os.listdir(os.path.join(pooling_structure, "input_pool"))
+        assert len(os.listdir(os.path.join(pooling_structure, "input_pool_completed"))) == 1
+        assert Path(mock_config.error_log_filepath).read_text(encoding="utf-8") == f"en_to_fr\t{remaining}\tOPENROUTER_RESPONSE_EMPTY\n"
+
+    def test_api_error_leaves_files_in_pool(self, mock_config, pooling_structure):
+        """Test that a failed batch request leaves every file in the pool and records each in the error log."""
+        with patch('src.translate_single_file._request_completion', side_effect=RuntimeError("boom")):
+            completed = translate_batch(mock_config, TypeOfTranslation.en_to_fr, batch_size=16)
+
+        assert completed == 0
+        assert len(os.listdir(os.path.join(pooling_structure, "input_pool"))) == 2
+        assert os.listdir(os.path.join(pooling_structure, "french_pool")) == []
+        assert sorted(Path(mock_config.error_log_filepath).read_text(encoding="utf-8").splitlines()) == [
+            "en_to_fr\tsample_0.txt\tOPENROUTER_API_ERROR: boom",
+            "en_to_fr\tsample_1.txt\tOPENROUTER_API_ERROR: boom",
+        ]
+
+    def test_empty_pool_raises(self, mock_config, pooling_structure):
+        """Test that an empty input pool raises RuntimeError."""
+        with pytest.raises(RuntimeError, match="No files found"):
+            translate_batch(mock_config, TypeOfTranslation.fr_to_en, batch_size=4)
+
+    def test_failed_output_write_stays_in_pool(self, mock_config, pooling_structure):
+        """Test that a file whose output cannot be written is not moved."""
+        def fail_first(paths, buffers, renames):
+            return [(OSError(28, "No space left on device"), None)] + [(None, None)] * (len(paths) - 1)
+
+        with patch('src.translate_single_file._request_completion', side_effect=_echo_batch), \
+             patch('src.uring_reader.write_many', side_effect=fail_first):
+            completed = translate_batch(mock_config, TypeOfTranslation.en_to_fr, batch_size=16)
+
+        assert completed == 1
+
+    def test_rename_error_falls_back_to_move(self, mock_config, pooling_structure):
+        """Test that a failed linked rename is retried through the regular move."""
+        def write_only(paths, buffers, renames):
+            for path, buffer in zip(paths, buffers):
+                with open(path, "wb") as f:
+                    f.write(buffer)
+            return [(None, OSError(18, "Invalid cross-device link"))] * len(paths)
+
+        with patch('src.translate_single_file._request_completion', side_effect=_echo_batch), \
+             patch('src.uring_reader.write_many', side_effect=write_only):
+            completed = translate_batch(mock_config, TypeOfTranslation.en_to_fr, batch_size=16)
+
+        assert completed == 2
+        assert os.listdir(os.path.join(pooling_structure, "input_pool")) == []
+        assert len(os.listdir(os.path.join(pooling_structure, "input_pool_completed"))) == 2
+
+
+def _run_concurrent(config, translation_type):
+    return translate_files_concurrent(config, translation_type, n_parallel=4)
+
+
+def _run_async(config, translation_type):
+    return translate_files_async(config, translation_type, concurrency=4)
+
+
+def _run_parallel(config, translation_type):
+    # A thread pool of the same interface, so that the patched calls are visible to the workers.
+    with patch('src.translate_single_file.multiprocessing.Pool', multiprocessing.dummy.Pool):
+        return translate_n_files_parallel(config, translation_type, n=4)
+
+
+class TestWholePoolDrivers:
+    """Test the behaviour shared by the concurrent, asyncio and multiprocessing drivers."""
+
+    @pytest.fixture(params=[_run_concurrent, _run_async, _run_parallel], ids=["concurrent", "async", "parallel"])
+    def run_driver(self, request):
+        """A driver that translates the pool with four workers."""
+        if request.param is _run_async:
+            pytest.importorskip("aiohttp")
+        return request.param
+
+    @staticmethod
+    def _patch_requests(**kwargs):
+        """Patch the blocking and the asyncio API call alike."""
+        stack = ExitStack()
+        stack.enter_context(patch('src.translate_single_file._request_completion', **kwargs))
+        stack.enter_context(patch('src.translate_single_file._request_completion_async', new=AsyncMock(**kwargs)))
+        return stack
+
+    def test_translates_whole_pool(self, run_driver, mock_config, pooling_structure):
+        """Test that every file in the pool is translated and moved."""
+        with self._patch_requests(return_value=TRANSLATION):
+            completed = run_driver(mock_config, TypeOfTranslation.en_to_fr)
+
+        assert completed == 2
+        assert os.listdir(os.path.join(pooling_structure, "input_pool")) == []
+        assert sorted(os.listdir(os.path.join(pooling_structure, "french_pool"))) == ["sample_0.txt", "sample_1.txt"]
+        assert Path(pooling_structure, "french_pool", "sample_0.txt").read_text(encoding="utf-8") == TRANSLATION
+
+    @pytest.mark.parametrize("response,marker", [
+        ({"side_effect": RuntimeError("boom")}, "OPENROUTER_API_ERROR: boom"),
+        ({"return_value": ""}, "OPENROUTER_RESPONSE_EMPTY"),
+    ], ids=["api_error", "empty_response"])
+    def test_failed_request_stays_in_pool(self, run_driver, mock_config, pooling_structure, response, marker):
+        """Test that a failed or empty API response is recorded in the error log and the file not moved."""
+        with self._patch_requests(**response):
+            completed = run_driver(mock_config, TypeOfTranslation.en_to_fr)
+
+        assert completed == 0
+        assert len(os.listdir(os.path.join(pooling_structure, "input_pool"))) == 2
+        assert sorted(Path(mock_config.error_log_filepath).read_text(encoding="utf-8").splitlines()) == [
+            f"en_to_fr\tsample_0.txt\t{marker}",
+            f"en_to_fr\tsample_1.txt\t{marker}",
+        ]
+
+    def test_failed_task_stays_in_pool(self, run_driver, mock_config, pooling_structure):
+        """Test that a file whose task raises is not moved."""
+        with patch('src.translate_single_file._read_input_text', side_effect=OSError("disk error")):
+            completed = run_driver(mock_config, TypeOfTranslation.en_to_fr)
+
+        assert completed == 0
+        assert len(os.listdir(os.path.join(pooling_structure, "input_pool"))) == 2
+
+    def test_empty_pool_raises(self, run_driver, mock_config, pooling_structure):
+        """Test that an empty input pool raises RuntimeError."""
+        with pytest.raises(RuntimeError, match="No files found"):
+            run_driver(mock_config, TypeOfTranslation.fr_to_en)
+
+
+class TestTranslateFilesAsync:
+    """Test the asyncio translation path."""
+
+    def test_falls_back_without_aiohttp(self, mock_config, pooling_structure):
+        """Test that the threaded driver is used when aiohttp is missing."""
+        with patch.dict(sys.modules, {"aiohttp": None}), \
+             patch('src.translate_single_file.translate_files_concurrent', return_value=2) as mock_concurrent:
+            assert translate_files_async(mock_config, TypeOfTranslation.en_to_fr, concurrency=4) == 2
+
+        mock_concurrent.assert_called_once_with(mock_config, TypeOfTranslation.en_to_fr, n_parallel=4)
+
+
+class TestTranslateNFilesParallel:
+    """Test the multiprocessing translation path."""
+
+    def test_translates_up_to_n_files(self, mock_config, pooling_structure):
+        """Test that at most n files are translated and moved."""
+        with patch('src.translate_single_file.multiprocessing.Pool', multiprocessing.dummy.Pool), \
+             patch('src.translate_single_file._request_completion', return_value=TRANSLATION) as mock_request:
+            completed = translate_n_files_parallel(mock_config, TypeOfTranslation.en_to_fr, n=1)
+
+        assert completed == 1
+        assert mock_request.call_count == 1
+        assert len(os.listdir(os.path.join(pooling_structure, "input_pool"))) == 1
+        assert len(os.listdir(os.path.join(pooling_structure, "input_pool_completed"))) == 1
+
+    @pytest.mark.skipif(multiprocessing.get_start_method() != "fork",
+                        reason="the patched API call only reaches forked workers")
+    def test_worker_records_reach_log_file(self, mock_config, pooling_structure):
+        """Test that records logged in a real worker process are written to the log file."""
+        log_single_file.setup_logging(mock_config.log_filepath)
+        with patch('src.translate_single_file._request_completion', side_effect=RuntimeError("boom")):
+            translate_n_files_parallel(mock_config, TypeOfTranslation.en_to_fr, n=1)
+        log_single_file.stop_logging()
+
+        log_text = Path(mock_config.log_filepath).read_text(encoding="utf-8")
+        assert "Error during OpenRouter API call" in log_text
+
+
+class TestMoveInputToCompleted:
+    """Test moving processed input files."""
+
+    def test_cross_device_falls_back_to_shutil_move(self, mock_config, pooling_structure):
+        """Test that EXDEV from os.rename falls back to shutil.move."""
+        cross_device = OSError(errno.EXDEV, "Invalid cross-device link")
+        with patch('src.translate_single_file.os.rename', side_effect=cross_device), \
+             patch('src.translate_single_file.shutil.move') as mock_move:
+            _move_input_to_completed(mock_config, TypeOfTranslation.en_to_fr, "sample_0.txt")
+
+        mock_move.assert_called_once_with(
+            os.path.join(pooling_structure, "input_pool", "sample_0.txt"),
+            os.path.join(pooling_structure, "input_pool_completed", "sample_0.txt"),
+        )
+
+    def test_missing_file_is_not_an_error(self, mock_config, pooling_structure):
+        """Test that a missing input file is logged and ignored."""
+        _move_input_to_completed(mock_config, TypeOfTranslation.en_to_fr, "missing.txt")
+
+        assert os.listdir(os.path.join(pooling_structure, "input_pool_completed")) == []
+
+    def test_missing_completed_dir_raises_oserror(self, mock_config, pooling_structure):
+        """Test that a completed directory removed mid-run is an error, not a missing input."""
+        completed_dir = os.path.join(pooling_structure, "input_pool_completed")
+        _move_input_to_completed(mock_config, TypeOfTranslation.en_to_fr, "sample_0.txt")
+        shutil.rmtree(completed_dir)
+
+        with pytest.raises(OSError, match="Failed to move file"):
+            _move_input_to_completed(mock_config, TypeOfTranslation.en_to_fr, "sample_1.txt")
+
+        assert os.listdir(os.path.join(pooling_structure, "input_pool")) == ["sample_1.txt"]
+
+    def test_other_errors_raise_oserror(self, mock_config, pooling_structure):
+        """Test that other failures are re-raised as OSError."""
+        with patch('src.translate_single_file.os.rename', side_effect=PermissionError("denied")):
+            with pytest.raises(OSError, match="Failed to move file"):
+                _move_input_to_completed(mock_config, TypeOfTranslation.en_to_fr, "sample_0.txt")
+
+    def test_completed_dir_created_once(self, mock_config, pooling_structure):
+        """Test that the completed directory is only created on the first move."""
+        with patch('src.translate_single_file.os.makedirs') as mock_makedirs:
+            _move_input_to_completed(mock_config, TypeOfTranslation.en_to_fr, "sample_0.txt")
+            _move_input_to_completed(mock_config, TypeOfTranslation.en_to_fr, "sample_1.txt")
+
+        mock_makedirs.assert_called_once_with(os.path.join(pooling_structure, "input_pool_completed"), exist_ok=True)
@@ -0,0 +1,49 @@
+"""
+Unit tests for the translation_cache module.
+"""
+
+import os
+from unittest.mock import patch
+
+from src import translation_cache
+from src.config import TypeOfTranslation
+
+
+class TestMakeKey:
+    """Test the make_key function."""
+
+    def test_key_is_stable(self):
+        """Test that identical requests produce identical keys."""
+        key = translation_cache.make_key(TypeOfTranslation.en_to_fr, "model", "Hello")
+        assert key == translation_cache.make_key(TypeOfTranslation.en_to_fr, "model", "Hello")
+        assert len(key) == 32
+
+    def test_key_depends_on_every_component(self):
+        """Test that direction, model and text all change the key."""
+        key = translation_cache.make_key(TypeOfTranslation.en_to_fr, "model", "Hello")
+        assert key != translation_cache.make_key(TypeOfTranslation.fr_to_en, "model", "Hello")
+        assert key != translation_cache.make_key(TypeOfTranslation.en_to_fr, "other-model", "Hello")
+        assert key != translation_cache.make_key(TypeOfTranslation.en_to_fr, "model", "Hello!")
+
+
+class TestGetPut:
+    """Test storing and retrieving cache entries."""
+
+    def test_miss_returns_none(self, temp_dir):
+        """Test that a missing entry returns None."""
+        assert translation_cache.get(temp_dir, "0" * 32) is None
+
+    def test_put_then_get(self, temp_dir):
+        """Test that a stored entry is returned and sharded by key prefix."""
+        key = translation_cache.make_key(TypeOfTranslation.en_to_fr, "model", "Hello")
+        translation_cache.put(temp_dir, key, "Bonjour")
+
+        assert translation_cache.get(temp_dir, key) == "Bonjour"
+        assert os.listdir(os.path.join(temp_dir, key[:2])) == [f"{key}.txt"]
+
+    def test_put_failure_is_ignored(self, temp_dir):
+        """Test that a failed write is logged, not raised."""
+        with patch('src.translation_cache.os.makedirs', side_effect=OSError("read-only")):
+            translation_cache.put(temp_dir, "ab" * 16, "Bonjour")
+
+        assert translation_cache.get(temp_dir, "ab" * 16) is None
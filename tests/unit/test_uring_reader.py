@@ -0,0 +1,142 @@
+"""
+Unit tests for the uring_reader module.
+"""
+
+import os
+from unittest.mock import patch
+
+import pytest
+
+from src.uring_reader import (
+    FileTooLargeError,
+    read_file,
+    read_many,
+    write_many,
+    _read_many_uring,
+    _write_many_uring,
+)
+
+
+def _names(dir_path):
+    """Returns the entry names of a directory from a single scan."""
+    with os.scandir(dir_path) as entries:
+        return {entry.name for entry in entries}
+
+
+@pytest.fixture(params=["blocking", "io_uring"])
+def reader_backend(request):
+    """Run a test against both the blocking fallback and the io_uring path."""
+    if request.param == "blocking":
+        with patch('src.uring_reader._get_liburing', return_value=None):
+            yield request.param
+    else:
+        liburing = pytest.importorskip("liburing")
+        # read_many/write_many quietly fall back to blocking I/O if the ring
+        # fails, so check that it was actually used.
+        with patch('src.uring_reader._get_liburing', return_value=liburing), \
+             patch('src.uring_reader._read_many_uring', wraps=_read_many_uring) as read_uring, \
+             patch('src.uring_reader._write_many_uring', wraps=_write_many_uring) as write_uring, \
+             patch('src.uring_reader.logger.warning') as mock_warning:
+            yield request.param
+        assert read_uring.called or write_uring.called
+        mock_warning.assert_not_called()
+
+
+@pytest.fixture
+def sample_files(temp_dir):
+    """Create files with known contents, including an empty one."""
+    contents = {"a.txt": b"hello", "b.txt": "h\xe9llo w\xf6rld".encode("utf-8"), "empty.txt": b""}
+    paths = {}
+    for name, data in contents.items():
+        paths[name] = os.path.join(temp_dir, name)
+        with open(paths[name], "wb") as f:
+            f.write(data)
+    return paths, contents
+
+
+class TestReadFile:
+    """Test the read_file function."""
+
+    def test_reads_contents(self, sample_files):
+        """Test that the whole file is returned."""
+        paths, contents = sample_files
+        assert read_file(paths["b.txt"]) == contents["b.txt"]
+
+    def test_rejects_large_file(self, sample_files):
+        """Test that files above max_size raise FileTooLargeError."""
+        paths, _ = sample_files
+        with pytest.raises(FileTooLargeError) as excinfo:
+            read_file(paths["a.txt"], max_size=4)
+        assert excinfo.value.size == 5
+
+
+class TestReadMany:
+    """Test the read_many function."""
+
+    def test_reads_all_files_in_order(self, reader_backend, sample_files):
+        """Test that results line up with the requested paths."""
+        paths, contents = sample_files
+        names = ["b.txt", "empty.txt", "a.txt"]
+
+        assert read_many([paths[n] for n in names]) == [contents[n] for n in names]
+
+    def test_errors_are_returned_per_file(self, reader_backend, sample_files, temp_dir):
+        """Test that a failing file does not affect the others."""
+        paths, contents = sample_files
+        results = read_many([paths["a.txt"], os.path.join(temp_dir, "missing.txt"), paths["b.txt"]], max_size=5)
+
+        assert results[0] == contents["a.txt"]
+        assert isinstance(results[1], FileNotFoundError)
+        assert isinstance(results[2], FileTooLargeError)
+
+    def test_ring_setup_failure_falls_back(self, sample_files):
+        """Test that an unusable ring falls back to blocking reads."""
+        paths, contents = sample_files
+        with patch('src.uring_reader._liburing', None), \
+             patch('src.uring_reader._get_liburing', return_value=object()), \
+             patch('src.uring_reader._read_many_uring', side_effect=OSError(38, "Function not implemented")):
+            assert read_many([paths["a.txt"], paths["b.txt"]]) == [contents["a.txt"], contents["b.txt"]]
+
+
+class TestWriteMany:
+    """Test the write_many function."""
+
+    def test_writes_and_renames(self, reader_backend, sample_files, temp_dir):
+        """Test that each file is written and its linked rename applied."""
+        paths, _ = sample_files
+        moved = os.path.join(temp_dir, "moved.txt")
+        outputs = [os.path.join(temp_dir, "out1.txt"), os.path.join(temp_dir, "out2.txt")]
+
+        results = write_many(outputs, [b"one", b"two"], [(paths["a.txt"], moved), None])
+
+        assert results == [(None, None), (None, None)]
+        assert [read_file(p) for p in outputs] == [b"one", b"two"]
+        names = _names(temp_dir)
+        assert "moved.txt" in names and "a.txt" not in names
+
+    def test_failed_write_skips_rename(self, reader_backend, sample_files, temp_dir):
+        """Test that a rename does not run when its write failed."""
+        paths, _ = sample_files
+        outputs = [os.path.join(temp_dir, "missing_dir", "out.txt"), os.path.join(temp_dir, "out.txt")]
+        renames = [(paths["a.txt"], os.path.join(temp_dir, "a_moved.txt")),
+                   (paths["b.txt"], os.path.join(temp_dir, "b_moved.txt"))]
+
+        results = write_many(outputs, [b"one", b"two"], renames)
+
+        assert isinstance(results[0][0], FileNotFoundError)
+        assert results[0][1] is not None
+        assert results[1] == (None, None)
+        names = _names(temp_dir)
+        assert {"a.txt", "b_moved.txt"} <= names
+        assert "a_moved.txt" not in names and "b.txt" not in names
+
+    def test_rename_error_is_reported(self, reader_backend, sample_files, temp_dir):
+        """Test that a failed rename is reported without affecting the write."""
+        outputs = [os.path.join(temp_dir, "out1.txt"), os.path.join(temp_dir, "out2.txt")]
+        renames = [(os.path.join(temp_dir, "gone.txt"), os.path.join(temp_dir, "gone_moved.txt")), None]
+
+        results = write_many(outputs, [b"one", b"two"], renames)
+
+        assert results[0][0] is None
+        assert isinstance(results[0][1], FileNotFoundError)
+        assert read_file(outputs[0]) == b"one"
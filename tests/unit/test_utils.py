@@ -3,7 +3,10 @@ Unit tests for the utils module.
 """
 
 import os
-import tempfile
+import random
+import shlex
+import subprocess
+import sys
 import shutil
 from unittest.mock import patch
 from pathlib import Path
@@ -15,7 +18,13 @@ from src.utils import (
     is_dir_exist,
     is_file_has_size,
     is_files_left_in_dir,
-    get_random_file_from_dir
+    get_random_file_from_dir,
+    get_n_files_from_dir,
+    list_files_in_dir,
+    stat_file,
+    append_line,
+    close_append_files,
+    _SRC_DIR,
 )
 
 
@@ -31,9 +40,31 @@ class TestSh:
         sh("echo 'test'")
 
         # The cwd should be the src directory, not the test directory
-        import src.utils
-        expected_cwd = os.path.dirname(src.utils.__file__)
-        mock_run.assert_called_once_with(['echo', "'test'"], check=True, cwd=expected_cwd)
+        mock_run.assert_called_once_with(
+            ['echo', 'test'],
+            check=True,
+            cwd=_SRC_DIR,
+            close_fds=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+        )
+
+    @patch('src.utils.subprocess.run')
+    def test_sh_keeps_quoted_arguments(self, mock_run):
+        """Test that quoted arguments containing spaces stay together."""
+        sh('touch "file with spaces.txt"')
+
+        assert mock_run.call_args.args[0] == ['touch', 'file with spaces.txt']
+
+    @patch('src.utils.subprocess.run')
+    def test_sh_tokenizes_repeated_command_once(self, mock_run):
+        """Test that a repeated command is only split once."""
+        with patch('src.utils.shlex.split', wraps=shlex.split) as mock_split:
+            sh("echo 'tokenized once'")
+            sh("echo 'tokenized once'")
+
+        assert mock_split.call_count == 1
+        assert mock_run.call_args.args[0] == ['echo', 'tokenized once']
 
     @patch('src.utils.subprocess.run')
     def test_sh_failure(self, mock_run):
@@ -43,105 +74,185 @@ class TestSh:
         with pytest.raises(Exception, match="Command failed"):
             sh("failing_command")
 
+    def test_sh_failure_includes_stderr(self):
+        """Test that a failing command's stderr is part of the error."""
+        with pytest.raises(RuntimeError, match="exit code 3: .*oops"):
+            sh(f"{shlex.quote(sys.executable)} -c \"import sys; sys.stderr.write('oops'); sys.exit(3)\"")
+
 
 class TestIsDirExist:
     """Test the is_dir_exist function."""
 
-    def test_existing_directory(self):
+    def test_existing_directory(self, temp_dir):
         """Test with an existing directory."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            assert is_dir_exist(temp_dir) is True
+        assert is_dir_exist(temp_dir) is True
 
     def test_nonexistent_directory(self):
         """Test with a nonexistent directory."""
         assert is_dir_exist("/nonexistent/directory") is False
 
-    def test_file_as_directory(self):
+    def test_file_as_directory(self, tmp_path):
         """Test with a file instead of directory."""
-        with tempfile.NamedTemporaryFile() as temp_file:
-            assert is_dir_exist(temp_file.name) is False
+        temp_file = tmp_path / "file.txt"
+        temp_file.touch()
+
+        assert is_dir_exist(str(temp_file)) is False
 
 
 class TestIsFileHasSize:
     """Test the is_file_has_size function."""
 
-    def test_existing_file_correct_size(self):
+    def test_existing_file_correct_size(self, tmp_path):
         """Test with existing file of correct size."""
-        with tempfile.NamedTemporaryFile() as temp_file:
-            temp_file.write(b"12345")  # 5 bytes
-            temp_file.flush()
+        temp_file = tmp_path / "file.txt"
+        temp_file.write_bytes(b"12345")  # 5 bytes
 
-            assert is_file_has_size(temp_file.name, 5) is True
+        assert is_file_has_size(str(temp_file), 5) is True
 
-    def test_existing_file_wrong_size(self):
+    def test_existing_file_wrong_size(self, tmp_path):
         """Test with existing file of wrong size."""
-        with tempfile.NamedTemporaryFile() as temp_file:
-            temp_file.write(b"123")  # 3 bytes
-            temp_file.flush()
+        temp_file = tmp_path / "file.txt"
+        temp_file.write_bytes(b"123")  # 3 bytes
 
-            assert is_file_has_size(temp_file.name, 5) is False
+        assert is_file_has_size(str(temp_file), 5) is False
 
     def test_nonexistent_file(self):
         """Test with nonexistent file."""
         assert is_file_has_size("/nonexistent/file", 10) is False
 
 
+class TestAppendLine:
+    """Test the append_line function."""
+
+    def test_appends_through_one_descriptor(self, temp_dir):
+        """Test that lines are appended and the file is opened only once."""
+        path = os.path.join(temp_dir, "errors.log")
+        Path(path).write_text("existing\n")
+
+        with patch('src.utils.os.open', wraps=os.open) as mock_open:
+            append_line(path, "first")
+            append_line(path, "second")
+        close_append_files()
+
+        assert mock_open.call_count == 1
+        assert Path(path).read_text(encoding="utf-8") == "existing\nfirst\nsecond\n"
+
+    def test_missing_directory_raises(self):
+        """Test that an unwritable path raises OSError."""
+        with pytest.raises(OSError):
+            append_line("/nonexistent/directory/errors.log", "line")
+
+
+class TestStatFile:
+    """Test the stat_file function."""
+
+    def test_stat_reflects_file_changes(self, tmp_path):
+        """Test that each lookup stats the file afresh."""
+        temp_file = tmp_path / "file.txt"
+        temp_file.write_bytes(b"12345")
+        path = str(temp_file)
+
+        assert stat_file(path).st_size == 5
+        assert is_file_has_size(path, 5) is True
+
+        temp_file.write_bytes(b"1234567")
+        assert is_file_has_size(path, 7) is True
+
+        temp_file.unlink()
+        assert stat_file(path) is None
+        assert is_file_has_size(path, 7) is False
+
+    def test_missing_file_is_found_once_created(self, temp_dir):
+        """Test that a file created after a failed lookup is found."""
+        path = os.path.join(temp_dir, "later.txt")
+        assert stat_file(path) is None
+
+        Path(path).write_text("content")
+        assert stat_file(path) is not None
+
+
 class TestIsFilesLeftInDir:
     """Test the is_files_left_in_dir function."""
 
-    def test_directory_with_files(self):
+    def test_directory_with_files(self, temp_dir):
         """Test directory containing files."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Create a file in the directory
-            test_file = os.path.join(temp_dir, "test.txt")
-            with open(test_file, "w") as f:
-                f.write("content")
+        # Create a file in the directory
+        test_file = os.path.join(temp_dir, "test.txt")
+        Path(test_file).write_text("content")
 
-            assert is_files_left_in_dir(temp_dir) is True
+        assert is_files_left_in_dir(temp_dir) is True
 
-    def test_empty_directory(self):
+    def test_empty_directory(self, temp_dir):
         """Test empty directory."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            assert is_files_left_in_dir(temp_dir) is False
+        assert is_files_left_in_dir(temp_dir) is False
 
     def test_nonexistent_directory(self):
         """Test nonexistent directory."""
         assert is_files_left_in_dir("/nonexistent/directory") is False
 
-    def test_directory_with_only_subdirectories(self):
+    def test_directory_with_only_subdirectories(self, temp_dir):
         """Test directory with only subdirectories (no files)."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Create a subdirectory
-            sub_dir = os.path.join(temp_dir, "subdir")
-            os.makedirs(sub_dir)
+        # Create a subdirectory
+        sub_dir = os.path.join(temp_dir, "subdir")
+        os.makedirs(sub_dir)
+
+        assert is_files_left_in_dir(temp_dir) is False
+
+    def test_stops_at_first_file(self, temp_dir):
+        """Test that the scan stops at the first file instead of reading the whole directory."""
+        for i in range(5):
+            Path(temp_dir, f"test_{i}.txt").write_text("content")
 
-            assert is_files_left_in_dir(temp_dir) is False
+        real_scandir = os.scandir
+        consumed = []
+
+        class CountingScandir:
+            def __init__(self, path):
+                self._entries = real_scandir(path)
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                self._entries.close()
+
+            def __iter__(self):
+                for entry in self._entries:
+                    consumed.append(entry.name)
+                    yield entry
+
+        with patch('src.utils.os.scandir', CountingScandir):
+            assert is_files_left_in_dir(temp_dir) is True
+        assert len(consumed) == 1
 
 
 class TestGetRandomFileFromDir:
     """Test the get_random_file_from_dir function."""
 
-    def test_get_random_file_success(self):
+    def test_get_random_file_success(self, temp_dir):
         """Test successfully getting a random file from directory."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Create multiple files
-            files = []
-            for i in range(3):
-                file_path = os.path.join(temp_dir, f"test_{i}.txt")
-                with open(file_path, "w") as f:
-                    f.write(f"content {i}")
-                files.append(f"test_{i}.txt")
-
-            # Should return one of the files
-            result = get_random_file_from_dir(temp_dir)
-            assert result in files
-            assert os.path.exists(os.path.join(temp_dir, result))
-
-    def test_get_random_file_empty_directory(self):
+        # Create multiple files relative to one directory descriptor
+        files = [f"test_{i}.txt" for i in range(3)]
+        dir_fd = os.open(temp_dir, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            for i, name in enumerate(files):
+                fd = os.open(name, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644, dir_fd=dir_fd)
+                try:
+                    os.write(fd, f"content {i}".encode())
+                finally:
+                    os.close(fd)
+        finally:
+            os.close(dir_fd)
+
+        # Should return one of the files
+        result = get_random_file_from_dir(temp_dir)
+        assert result in files
+        assert os.path.exists(os.path.join(temp_dir, result))
+
+    def test_get_random_file_empty_directory(self, temp_dir):
         """Test getting random file from empty directory."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            with pytest.raises(RuntimeError, match=r"No files found in directory: .*"):
-                get_random_file_from_dir(temp_dir)
+        with pytest.raises(RuntimeError, match=r"No files found in directory: .*"):
+            get_random_file_from_dir(temp_dir)
 
     def test_get_random_file_nonexistent_directory(self):
         """Test getting random file from nonexistent directory."""
@@ -149,67 +260,121 @@ class TestGetRandomFileFromDir:
         with pytest.raises(RuntimeError, match=f"No files found in directory: {nonexistent_dir}"):
             get_random_file_from_dir(nonexistent_dir)
 
-    def test_get_random_file_with_subdirectories(self):
+    def test_get_random_file_with_subdirectories(self, temp_dir):
         """Test that subdirectories are ignored, only files are considered."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Create a file and a subdirectory
-            file_path = os.path.join(temp_dir, "test.txt")
-            with open(file_path, "w") as f:
-                f.write("content")
+        # Create a file and a subdirectory
+        file_path = os.path.join(temp_dir, "test.txt")
+        Path(file_path).write_text("content")
+
+        sub_dir = os.path.join(temp_dir, "subdir")
+        os.makedirs(sub_dir)
 
-            sub_dir = os.path.join(temp_dir, "subdir")
-            os.makedirs(sub_dir)
+        # Should return the file, not the subdirectory
+        result = get_random_file_from_dir(temp_dir)
+        assert result == "test.txt"
 
-            # Should return the file, not the subdirectory
-            result = get_random_file_from_dir(temp_dir)
-            assert result == "test.txt"
+    def test_get_random_file_reaches_every_file(self, temp_dir):
+        """Test that every file in the directory can be selected."""
+        names = {f"test_{i}.txt" for i in range(4)}
+        for name in names:
+            Path(temp_dir, name).write_text("content")
+
+        random.seed(0)
+        assert {get_random_file_from_dir(temp_dir) for _ in range(200)} == names
+
+
+class TestListFilesInDir:
+    """Test the list_files_in_dir function."""
+
+    def test_lists_only_files(self, temp_dir):
+        """Test that subdirectories are excluded from the listing."""
+        for name in ("a.txt", "b.txt"):
+            Path(temp_dir, name).write_text("content")
+        os.makedirs(os.path.join(temp_dir, "subdir"))
+
+        assert sorted(list_files_in_dir(temp_dir)) == ["a.txt", "b.txt"]
+
+    def test_empty_directory(self, temp_dir):
+        """Test that an empty directory yields an empty list."""
+        assert list_files_in_dir(temp_dir) == []
+
+    def test_nonexistent_directory(self):
+        """Test that a nonexistent directory is treated as empty."""
+        assert list_files_in_dir("/nonexistent/directory") == []
+
+    @patch('src.utils.os.scandir', side_effect=PermissionError("denied"))
+    def test_unreadable_directory(self, mock_scandir):
+        """Test that an unreadable directory raises RuntimeError."""
+        with pytest.raises(RuntimeError, match="Cannot access directory"):
+            list_files_in_dir("/some/directory")
+
+
+class TestGetNFilesFromDir:
+    """Test the get_n_files_from_dir function."""
+
+    def test_returns_requested_number_of_distinct_files(self, temp_dir):
+        """Test that n distinct files are returned when enough exist."""
+        for i in range(5):
+            Path(temp_dir, f"test_{i}.txt").write_text(f"content {i}")
+
+        result = get_n_files_from_dir(temp_dir, 3)
+        assert len(result) == 3
+        assert len(set(result)) == 3
+        assert set(result) <= {f"test_{i}.txt" for i in range(5)}
+
+    def test_returns_all_files_when_fewer_than_n(self, temp_dir):
+        """Test that all files are returned when the directory has fewer than n."""
+        Path(temp_dir, "test.txt").write_text("content")
+        os.makedirs(os.path.join(temp_dir, "subdir"))
+
+        assert get_n_files_from_dir(temp_dir, 10) == ["test.txt"]
+
+    def test_empty_directory(self, temp_dir):
+        """Test that an empty directory raises RuntimeError."""
+        with pytest.raises(RuntimeError, match=r"No files found in directory: .*"):
+            get_n_files_from_dir(temp_dir, 3)
 
 
 
 class TestUtilsIntegration:
     """Integration tests for utils functions."""
 
-    def test_directory_workflow(self):
+    def test_directory_workflow(self, temp_dir):
         """Test typical directory workflow."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Initially empty
-            assert is_files_left_in_dir(temp_dir) is False
+        # Initially empty
+        assert is_files_left_in_dir(temp_dir) is False
 
-            # Add a file
-            test_file = os.path.join(temp_dir, "test.txt")
-            with open(test_file, "w") as f:
-                f.write("content")
+        # Add a file
+        test_file = os.path.join(temp_dir, "test.txt")
+        Path(test_file).write_text("content")
 
-            # Now has files
-            assert is_files_left_in_dir(temp_dir) is True
+        # Now has files
+        assert is_files_left_in_dir(temp_dir) is True
 
-            # Can get random file
-            random_file = get_random_file_from_dir(temp_dir)
-            assert random_file == "test.txt"
+        # Can get random file
+        random_file = get_random_file_from_dir(temp_dir)
+        assert random_file == "test.txt"
 
-            # File has correct size
-            assert is_file_has_size(test_file, 7) is True  # "content" is 7 bytes
+        # File has correct size
+        assert is_file_has_size(test_file, 7) is True  # "content" is 7 bytes
 
-    def test_file_operations_workflow(self):
+    def test_file_operations_workflow(self, temp_dir):
         """Test file operations workflow."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Create files of different sizes
-            small_file = os.path.join(temp_dir, "small.txt")
-            large_file = os.path.join(temp_dir, "large.txt")
+        # Create files of different sizes
+        small_file = os.path.join(temp_dir, "small.txt")
+        large_file = os.path.join(temp_dir, "large.txt")
 
-            with open(small_file, "w") as f:
-                f.write("small")
+        Path(small_file).write_text("small")
 
-            with open(large_file, "w") as f:
-                f.write("this is a larger file content")
+        Path(large_file).write_text("this is a larger file content")
 
-            # Check sizes
-            assert is_file_has_size(small_file, 5) is True
-            assert is_file_has_size(large_file, 29) is True  # "this is a larger file content" = 29 chars
+        # Check sizes
+        assert is_file_has_size(small_file, 5) is True
+        assert is_file_has_size(large_file, 29) is True  # "this is a larger file content" = 29 chars
 
-            # Directory should have files
-            assert is_files_left_in_dir(temp_dir) is True
+        # Directory should have files
+        assert is_files_left_in_dir(temp_dir) is True
 
-            # Random file should be one of the two
-            random_file = get_random_file_from_dir(temp_dir)
-            assert random_file in ["small.txt", "large.txt"]
\ No newline at end of file
+        # Random file should be one of the two
+        random_file = get_random_file_from_dir(temp_dir)
+        assert random_file in ["small.txt", "large.txt"]
\ No newline at end of file